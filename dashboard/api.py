@@ -0,0 +1,172 @@
+"""Query API over the benchmark data.
+
+`GET /api/scores` returns the rows of the scores table of `Database`, filtered by the query parameters:
+
+- `benchmark`, `capability`, `org`, `country`: exact match, repeat a parameter to match any of several values
+- `start`, `end`: inclusive range of release dates (YYYY-MM-DD)
+- `limit`: page size (default 1000, at most 10000)
+- `cursor`: the `X-Next-Cursor` header of the previous page
+- `format`: `ndjson` (default) or `csv`
+
+Pages are keyset-paginated on (model, benchmark), so fetching a page costs the same regardless of its position, and
+rows are streamed to the client in chunks so memory stays bounded for large pages.
+"""
+
+import base64
+import csv
+import io
+import json
+from datetime import date
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+from sqlalchemy import bindparam, text
+
+from dashboard.data.database import COLUMNS, TABLE, Database
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+CHUNK_SIZE = 500
+
+FILTER_COLUMNS = ["benchmark", "capability", "org", "country"]
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+
+class InvalidQuery(ValueError):
+    """Raised for invalid query parameters."""
+
+
+def encode_cursor(model: str, benchmark: str) -> str:
+    """Encode the key of the last row of a page into an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([model, benchmark]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor created by `encode_cursor`."""
+    try:
+        model, benchmark = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidQuery("Invalid cursor") from e
+    return model, benchmark
+
+
+def parse_date(name: str) -> str | None:
+    """Return a date parameter in ISO format, or None if it is not given."""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError as e:
+        raise InvalidQuery(f"Invalid date for '{name}': {value}") from e
+
+
+def parse_limit() -> int:
+    """Return the requested page size."""
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError as e:
+        raise InvalidQuery("'limit' must be an integer") from e
+    if not 1 <= limit <= MAX_LIMIT:
+        raise InvalidQuery(f"'limit' must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def build_filters() -> tuple[list[str], dict]:
+    """Translate the query parameters into SQL conditions and their bound parameters."""
+    conditions = []
+    params = {}
+
+    for column in FILTER_COLUMNS:
+        values = request.args.getlist(column)
+        if values:
+            conditions.append(f"{column} IN :{column}")
+            params[column] = values
+
+    for name, operator in (("start", ">="), ("end", "<=")):
+        value = parse_date(name)
+        if value is not None:
+            conditions.append(f"date {operator} :{name}")
+            params[name] = value
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        conditions.append("(model, benchmark) > (:cursor_model, :cursor_benchmark)")
+        params["cursor_model"], params["cursor_benchmark"] = decode_cursor(cursor)
+
+    return conditions, params
+
+
+def query(columns: str, conditions: list[str], params: dict, suffix: str):
+    """Build a query on the scores table, expanding the list parameters of the `IN` filters."""
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    statement = text(f"SELECT {columns} FROM {TABLE} {where} ORDER BY model, benchmark {suffix}")
+    return statement.bindparams(*(bindparam(column, expanding=True) for column in FILTER_COLUMNS if column in params))
+
+
+def to_ndjson(columns: list[str], rows: list) -> str:
+    return "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+
+
+def to_csv(columns: list[str], rows: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+@api.errorhandler(InvalidQuery)
+def bad_request(e: InvalidQuery):
+    return jsonify(error=str(e)), 400
+
+
+@api.get("/scores")
+def scores() -> Response:
+    """Stream one page of filtered scores."""
+    output_format = request.args.get("format", "ndjson")
+    if output_format not in FORMATS:
+        raise InvalidQuery(f"'format' must be one of {', '.join(FORMATS)}")
+    limit = parse_limit()
+    conditions, params = build_filters()
+
+    database = Database()
+    database.load()  # No-op unless the data version changed
+    engine = database.engine
+
+    # The boundary and the rows are read on one connection, within one read transaction, so that both see the same
+    # data version even if a sync commits in between. The connection is closed once the response has been sent.
+    conn = engine.connect()
+    try:
+        # The key of the last row of the page is the next cursor, if a row follows it
+        boundary = conn.execute(
+            query("model, benchmark", conditions, params, "LIMIT 2 OFFSET :boundary"),
+            {**params, "boundary": limit - 1},
+        ).all()
+    except Exception:
+        conn.close()
+        raise
+
+    headers = {}
+    if len(boundary) == 2:
+        next_cursor = encode_cursor(*boundary[0])
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = url_for("api.scores", _external=True, **{**request.args.to_dict(flat=False), "cursor": next_cursor})
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    columns = list(COLUMNS)
+    serialize = to_ndjson if output_format == "ndjson" else to_csv
+
+    def generate():
+        if output_format == "csv":
+            yield serialize(columns, [columns])
+        result = conn.execution_options(stream_results=True).execute(
+            query(", ".join(columns), conditions, params, "LIMIT :limit"),
+            {**params, "limit": limit},
+        )
+        for rows in result.partitions(CHUNK_SIZE):
+            yield serialize(columns, rows)
+
+    response = Response(stream_with_context(generate()), mimetype=FORMATS[output_format], headers=headers)
+    # Also called when the client disconnects before the body is read, which rolls back the read transaction
+    response.call_on_close(conn.close)
+    return response
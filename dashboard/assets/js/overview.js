@@ -0,0 +1,67 @@
+/*
+ * Clientside callbacks of the overview page.
+ *
+ * The figure ships a timeline trace for every capability, followed by the improvement and annual growth bars (see
+ * build_figure in pages/overview.py). Changing the selection only toggles trace visibility and rebuilds the bars from
+ * the precomputed statistics in the `capability-data` store, without a round-trip to the server.
+ *
+ * Statistics are null for capabilities without enough data. They are left out of the aggregates, and shown as "–"
+ * when there is nothing to aggregate.
+ */
+const MISSING = "\u2013";
+
+const isValue = (value) => value !== null && value !== undefined && !Number.isNaN(value);
+
+const format = (value, prefix = "") => (isValue(value) ? `${prefix}${value.toFixed(1)}%` : MISSING);
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    overview: {
+        update_dashboard: function (selected, figure, data) {
+            selected = selected || [];
+            const chosen = new Set(selected);
+            const n = data.names.length;
+            const traces = figure.data.slice();
+
+            for (let i = 0; i < n; i++) {
+                traces[i] = Object.assign({}, traces[i], {visible: chosen.has(data.names[i])});
+            }
+
+            const idx = selected.map((name) => data.names.indexOf(name)).filter((i) => i >= 0);
+
+            // Bar 1: improvement, in selection order
+            const improvements = idx.map((i) => data.improvement[i]);
+            traces[n] = Object.assign({}, traces[n], {
+                y: idx.map((i) => data.labels[i]),
+                x: improvements,
+                text: improvements.map((value) => format(value, "+")),
+                marker: Object.assign({}, traces[n].marker, {color: idx.map((i) => data.colors[i])}),
+            });
+
+            // Bar 2: annual growth, sorted in descending order
+            const growthIdx = idx.filter((i) => isValue(data.growth[i])).sort((a, b) => data.growth[b] - data.growth[a]);
+            const growths = growthIdx.map((i) => data.growth[i]);
+            traces[n + 1] = Object.assign({}, traces[n + 1], {
+                y: growthIdx.map((i) => data.labels[i]),
+                x: growths,
+                text: growths.map((value) => format(value)),
+                marker: Object.assign({}, traces[n + 1].marker, {color: growthIdx.map((i) => data.colors[i])}),
+            });
+
+            const mean = (values) => {
+                values = values.filter(isValue);
+                return values.length ? values.reduce((a, b) => a + b, 0) / values.length : null;
+            };
+            const current = idx.map((i) => data.current[i]).filter(isValue);
+            const range = current.length
+                ? `${format(Math.min(...current))} - ${format(Math.max(...current))}`
+                : MISSING;
+
+            return [
+                Object.assign({}, figure, {data: traces}),
+                `${selected.length}/${n}`,
+                format(mean(improvements), "+"),
+                format(mean(growths)),
+                range,
+            ];
+        },
+    },
+});
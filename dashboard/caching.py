@@ -1,19 +1,99 @@
+import threading
+from functools import lru_cache
+
 import pandas as pd
+import plotly.graph_objects as go
 from flask_caching import Cache
 from pathlib import Path
-from dashboard.data.loader import loader
+from dashboard.data.normalize import load_long_table
+from dashboard.data.partition import PartitionIndex
+from dashboard.data.shared import SharedDataset
+from dashboard.data.store import data_version
+from dashboard.graphs.downsample import PIXEL_BUDGET
+from dashboard.graphs.graphs import graph_compute_vs_score, graph_score_by_org, graph_score_over_time
+from dashboard.metrics import CLEANED_DATA_SECONDS
 
 TIMEOUT = 60 * 60 * 24  # Cache data for approximately 1 day
 
-cache = Cache(config={"CACHE_TYPE": "filesystem", "CACHE_DIR": "cache"})
+cache = Cache(config={"CACHE_TYPE": "filesystem", "CACHE_DIR": "cache/flask"})
 
+FIGURES = {}  # (benchmark, data version) -> figures, see `benchmark_figures`
+figures_lock = threading.Lock()
 
 
 
 
 
-@cache.memoize(timeout=TIMEOUT)
+
+@CLEANED_DATA_SECONDS.time()
 def cleaned_data() -> pd.DataFrame:
-    """Function used to cache data."""
-    data = loader()
-    return data
+    """Function used to retrieve the data of the current data version."""
+    return versioned_data(data_version())
+
+
+def versioned_data(version: str) -> pd.DataFrame:
+    """Function used to retrieve the data of a data version.
+
+    The data is memory-mapped from the shared-memory copy published for that version (see `dashboard.data.shared`),
+    so worker processes share it instead of each unpickling their own copy from the filesystem cache.
+    """
+    return SharedDataset().get(version)
+
+
+@lru_cache(maxsize=1)
+def versioned_long_table(version: str) -> pd.DataFrame:
+    """Normalize the Epoch benchmark files into one long table once per process and data version."""
+    return load_long_table()
+
+
+@lru_cache(maxsize=1)
+def versioned_long_partition_index(version: str) -> PartitionIndex:
+    """Build the partition index of the long table of a data version once per process."""
+    return PartitionIndex(versioned_long_table(version), ["benchmark"])
+
+
+def benchmark_rows(benchmark: str, version: str) -> pd.DataFrame:
+    """Return the rows of a benchmark in the long table of a data version."""
+    return versioned_long_partition_index(version).select("benchmark", benchmark)
+
+
+def benchmark_figures(benchmark: str, version: str) -> dict:
+    """Return the figures of a benchmark for a data version.
+
+    The figures are held in a module-level dict, so that those built by the warm-up of the preloaded master (see
+    `gunicorn.conf.py`) are shared copy-on-write by the workers, instead of being read back from the filesystem cache
+    by every request. Figures missing from it, with lazy initialization or after the data version changed, are taken
+    from the filesystem cache shared by the workers, and built on a miss.
+    """
+    key = (benchmark, version)
+    figures = FIGURES.get(key)
+    if figures is None:
+        figures = cached_benchmark_figures(benchmark, version)
+        with figures_lock:
+            # Figures of older data versions are dropped
+            for stale in [other for other in FIGURES if other[1] != version]:
+                del FIGURES[stale]
+            FIGURES[key] = figures
+    return figures
+
+
+@cache.memoize(timeout=TIMEOUT)
+def cached_benchmark_figures(benchmark: str, version: str) -> dict:
+    """Build and cache the figures of a benchmark, memoized per (benchmark, data version)."""
+    df = benchmark_rows(benchmark, version)
+    return {
+        "score_over_time": graph_score_over_time(df),
+        "score_by_org": graph_score_by_org(df),
+        "compute_vs_score": graph_compute_vs_score(df),
+    }
+
+
+def score_over_time_figure(benchmark: str, version: str, date_range: list | None) -> go.Figure | None:
+    """Build the score over time figure of a benchmark for a date range, at the full resolution of the pixel budget.
+
+    Returns None if the benchmark has no more points than the budget, as the cached figure already shows all of them.
+    """
+    df = benchmark_rows(benchmark, version)
+    if len(df) <= PIXEL_BUDGET:
+        return None
+    return graph_score_over_time(df, date_range)
@@ -0,0 +1,192 @@
+"""Response compression and conditional requests for the Flask server of the app.
+
+Responses are compressed with brotli (if the `brotli` package is installed) or gzip, whichever the client prefers.
+Responses for immutable artifacts (the fingerprinted JavaScript bundles of Dash, and the files of `assets/` requested
+with the modification time Dash adds to their URL) are compressed once at the highest level and kept in memory.
+Streamed responses (the pages of the query API) are compressed chunk by chunk, and every chunk is flushed so that the
+client still receives the rows as they are read.
+
+GET responses get an ETag made of the data version and a hash of the body, so that a client revalidating a page or
+layout it already has receives a 304 without a body. Static and immutable responses are not hashed, as their URL
+already changes with their content, and neither are streamed responses and responses that must not be stored.
+"""
+
+import gzip
+import hashlib
+import zlib
+from collections import OrderedDict
+
+from flask import Flask, Response, g, request
+
+from dashboard.data.store import data_version
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = 500  # Bytes, smaller bodies are not worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+# Paths of responses that never change for a given URL
+IMMUTABLE_PREFIXES = ("/_dash-component-suites/",)
+# Files of `assets/`, whose URLs Dash versions with their modification time, e.g. `/assets/css/custom.css?m=1762442599`
+ASSETS_PREFIX = "/assets/"
+ASSETS_VERSION_ARG = "m"
+# Paths of files, which are fingerprinted or carry their own validators
+STATIC_PREFIXES = (*IMMUTABLE_PREFIXES, "/static/", "/assets/")
+IMMUTABLE_CACHE_SIZE = 256
+
+# Quality of on-the-fly compression, immutable responses are compressed once at the highest level
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+immutable_cache = OrderedDict()
+
+
+def supported_encodings() -> list[str]:
+    """Return the encodings the server can produce, in order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding() -> str | None:
+    """Return the preferred encoding accepted by the client, or None."""
+    accepted = request.accept_encodings
+    candidates = [encoding for encoding in supported_encodings() if accepted[encoding] > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: accepted[encoding])
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress data with the given encoding."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+
+def compress_immutable(key: str, data: bytes, encoding: str) -> bytes:
+    """Compress the body of an immutable response, reusing the result of previous requests."""
+    cache_key = (key, encoding)
+    if cache_key in immutable_cache:
+        immutable_cache.move_to_end(cache_key)
+        return immutable_cache[cache_key]
+
+    compressed = compress(data, encoding, best=True)
+    immutable_cache[cache_key] = compressed
+    if len(immutable_cache) > IMMUTABLE_CACHE_SIZE:
+        immutable_cache.popitem(last=False)
+    return compressed
+
+
+def compress_stream(body, chunks, encoding: str):
+    """Compress a streamed body chunk by chunk with the given encoding.
+
+    Args:
+        body: the iterable of the response, closed once the compressed stream is done or closed
+        chunks: the encoded chunks of the body
+        encoding (str): 'br' or 'gzip'
+    """
+    try:
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            # A window of 16 + 15 bits writes the gzip header and trailer
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+
+
+def is_immutable_request() -> bool:
+    """Return True if the response to the current request never changes for its URL."""
+    if request.path.startswith(IMMUTABLE_PREFIXES):
+        return True
+    return request.path.startswith(ASSETS_PREFIX) and ASSETS_VERSION_ARG in request.args
+
+
+def is_compressible(response: Response) -> bool:
+    return (
+        response.status_code == 200
+        # Files are sent as they are, except immutable ones which are compressed once
+        and (not response.direct_passthrough or is_immutable_request())
+        and "Content-Encoding" not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        # Streamed bodies have no length and are worth compressing, they are as large as a page of the API
+        and (response.is_streamed or (response.content_length or 0) >= MIN_SIZE)
+    )
+
+
+def request_data_version() -> str:
+    """Return the data version, read once per request."""
+    if "data_version" not in g:
+        g.data_version = data_version()
+    return g.data_version
+
+
+def add_etag(response: Response) -> Response:
+    """Tag a GET response with the data version and a hash of its body, and answer 304 if the client has it."""
+    if request.method != "GET" or response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return response
+    cache_control = response.headers.get("Cache-Control", "")
+    if request.path.startswith(STATIC_PREFIXES) or "immutable" in cache_control or "no-store" in cache_control:
+        return response
+    if "ETag" not in response.headers:
+        digest = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+        response.set_etag(f"{request_data_version()}-{digest}", weak=True)
+    if "Cache-Control" not in response.headers:
+        # Cacheable, but revalidated on every use as it changes with the data
+        response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+def compress_response(response: Response) -> Response:
+    """Compress a response body with the encoding negotiated with the client."""
+    if not is_compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        body = response.response
+        response.response = compress_stream(body, response.iter_encoded(), encoding)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    response.direct_passthrough = False
+    data = response.get_data()
+    if is_immutable_request():
+        compressed = compress_immutable(request.full_path, data, encoding)
+    else:
+        compressed = compress(data, encoding)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def register_compression(server: Flask) -> None:
+    """Add ETags, conditional responses and compression to every response of the Flask server."""
+
+    @server.after_request
+    def after_request(response: Response) -> Response:
+        # The ETag is computed over the uncompressed body, so it is the same for every encoding
+        return compress_response(add_etag(response))
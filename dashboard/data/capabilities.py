@@ -0,0 +1,258 @@
+"""Build `capability_heights.json` from the combined dataset.
+
+For every org slice, capability and year the height is the mean over the capability's benchmarks of the best
+normalized score. Years without data are linearly interpolated between observed years, and extrapolated with a fixed
+annual rate before the first and after the last observed year.
+
+The build is incremental: a fingerprint of the input rows of every capability is kept in `cache/`, and only
+capabilities whose fingerprint changed are recomputed. All capabilities are recomputed when the range of years of the
+dataset changes, as every capability is interpolated and extrapolated over it.
+
+Run `python -m dashboard.data.capabilities` to rebuild the file.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from dashboard.data.loader import loader
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+PROCESSED_DIR = ROOT_DIR / "data" / "processed"
+CAPABILITY_HEIGHTS_FILE = PROCESSED_DIR / "capability_heights.json"
+# Build state, not data, so it is kept out of the versioned directory
+FINGERPRINTS_FILE = ROOT_DIR / "cache" / "capability_heights.fingerprints.json"
+
+COLUMNS = ["model", "benchmark", "date", "org", "capability", "year", "score"]
+
+BACKWARD_RATE = 0.95  # Height multiplier per year before the first observed year
+FORWARD_RATE = 1.03  # Height multiplier per year after the last observed year
+
+ALL = "all"
+
+# Org slices, keyed on the primary (first listed) organization of a model
+ORG_SLICES = {
+    "openai": ["OpenAI"],
+    "anthropic": ["Anthropic"],
+    "google": ["Google DeepMind", "Google Research", "Google", "DeepMind"],
+    "meta": ["Meta AI"],
+    "mistral_tii": ["Mistral AI", "Technology Innovation Institute"],
+    "chinese_labs": ["DeepSeek", "Alibaba", "01.AI", "Moonshot", "Baichuan", "Zhipu AI", "MiniMax"],
+    "microsoft": ["Microsoft", "Microsoft Research"],
+    "startups": ["xAI", "Inflection AI", "Cohere", "Reka AI"],
+    "research_open": [
+        "Allen Institute for AI",
+        "EleutherAI",
+        "MosaicML",
+        "Salesforce",
+        "Salesforce Research",
+        "Hugging Face",
+        "Databricks",
+        "Cerebras Systems",
+        "Stability AI",
+        "Nous Research",
+        "Large Model Systems Organization",
+        "Tsinghua University",
+    ],
+}
+SLICES = [ALL, *ORG_SLICES]
+ORG_TO_SLICE = {org: org_slice for org_slice, orgs in ORG_SLICES.items() for org in orgs}
+
+
+class CapabilitySeries:
+    """Array-backed view of the capability heights of one org slice.
+
+    Years are sorted and scores scaled to percentages once, so that callers only need to index into the arrays.
+    """
+
+    def __init__(self, capabilities: dict):
+        self.names = list(capabilities)
+        self.position = {name: i for i, name in enumerate(self.names)}
+        self.categories = [capability["category"] for capability in capabilities.values()]
+
+        self.years = []
+        self.scores = []
+        for capability in capabilities.values():
+            years = sorted(capability["heights"])
+            self.years.append(years)
+            self.scores.append(np.array([capability["heights"][year] for year in years], dtype=float) * 100)
+
+        n_years = np.array([len(years) for years in self.years])
+        first = np.array([scores[0] if len(scores) else np.nan for scores in self.scores])
+        self.current = np.array([scores[-1] if len(scores) else np.nan for scores in self.scores])
+        self.improvement = self.current - first
+        # Average annual growth relative to the first year, undefined for a single year or a zero start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.growth = np.where((n_years > 1) & (first != 0), self.improvement / (n_years - 1) / first * 100, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def indices(self, names: list[str]) -> np.ndarray:
+        """Return the positions of the given capabilities."""
+        return np.array([self.position[name] for name in names], dtype=int)
+
+
+def load_capability_series(org_slice: str = ALL) -> CapabilitySeries:
+    """Load the capability heights of an org slice from `capability_heights.json`."""
+    with open(CAPABILITY_HEIGHTS_FILE, "r") as f:
+        data = json.load(f)
+    return CapabilitySeries(data[org_slice])
+
+
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the normalized score and org slice, and repeat every row for the 'all' slice."""
+    df = df.dropna(subset=["capability", "year", "score"]).copy()
+    df["year"] = df["year"].astype(int)
+    # Scores reported as percentages are brought back to fractions
+    df["normalized_score"] = df["score"].where(df["score"] <= 1, df["score"] / 100)
+    df["slice"] = df["org"].astype("string").str.split(",").str[0].map(ORG_TO_SLICE)
+
+    return pd.concat([df.assign(slice=ALL), df.dropna(subset=["slice"])], ignore_index=True)
+
+
+def compute_heights(df: pd.DataFrame, years: np.ndarray) -> pd.DataFrame:
+    """Compute the heights of every (slice, capability) for all years.
+
+    Args:
+        df (pd.DataFrame): prepared rows (see `prepare`)
+        years (np.ndarray): sorted years to compute the heights for
+
+    Returns:
+        pd.DataFrame: heights indexed by (slice, capability), one column per year
+    """
+    best = df.groupby(["slice", "capability", "year", "benchmark"], observed=True)["normalized_score"].max()
+    observed = best.groupby(level=["slice", "capability", "year"]).mean().unstack("year").reindex(columns=years)
+
+    # Linear interpolation between observed years
+    heights = observed.interpolate(axis=1, limit_area="inside").to_numpy()
+
+    has_data = ~np.isnan(heights)
+    rows = np.arange(len(heights))
+    first = has_data.argmax(axis=1)
+    last = len(years) - 1 - has_data[:, ::-1].argmax(axis=1)
+
+    first_year, first_value = years[first][:, None], heights[rows, first][:, None]
+    last_year, last_value = years[last][:, None], heights[rows, last][:, None]
+
+    before = years[None, :] < first_year
+    after = years[None, :] > last_year
+    heights = np.where(before, first_value * BACKWARD_RATE ** (first_year - years[None, :]), heights)
+    heights = np.where(after, last_value * FORWARD_RATE ** (years[None, :] - last_year), heights)
+
+    return pd.DataFrame(heights.round(3), index=observed.index, columns=years)
+
+
+def compute_top_models(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the best models of every (slice, capability, year, benchmark), ties included."""
+    keys = ["slice", "capability", "year", "benchmark"]
+    best = df["normalized_score"] == df.groupby(keys, observed=True)["normalized_score"].transform("max")
+    top = df[best].drop_duplicates(subset=[*keys, "model"])
+    return top.sort_values(["slice", "capability", "year", "normalized_score"], ascending=[True, True, True, False])
+
+
+def compute_fingerprints(df: pd.DataFrame) -> dict[str, str]:
+    """Return a fingerprint of the input rows of every capability."""
+    hashes = pd.util.hash_pandas_object(df[COLUMNS], index=False)
+    # Summing the row hashes (modulo 2**64) makes the fingerprint independent of the row order
+    sums = hashes.groupby(df["capability"].to_numpy()).sum()
+    return {str(capability): f"{value:016x}" for capability, value in sums.items()}
+
+
+def default_metadata(capability: str, benchmarks: list[str]) -> dict:
+    """Metadata of a capability that is not described in the existing file yet."""
+    return {
+        "name": capability.replace("_", " ").title(),
+        "category": "other",
+        "x": 0.5,
+        "y": 0.5,
+        "description": "",
+        "benchmarks": benchmarks,
+    }
+
+
+def build_capability_heights(df: pd.DataFrame | None = None, force: bool = False) -> dict:
+    """Build (or incrementally update) `capability_heights.json`.
+
+    Args:
+        df (pd.DataFrame | None): combined dataset, loaded from the store if None
+        force (bool): if True, all capabilities are recomputed
+
+    Returns:
+        dict: the capability heights, keyed by org slice and capability
+    """
+    if df is None:
+        # Full precision, the scores are written to the output as they are
+        df = loader(columns=COLUMNS, typed=False)
+    df = df.dropna(subset=["capability"])
+
+    existing = {}
+    if CAPABILITY_HEIGHTS_FILE.is_file():
+        with open(CAPABILITY_HEIGHTS_FILE, "r") as f:
+            existing = json.load(f)
+    previous = {}
+    if FINGERPRINTS_FILE.is_file() and not force:
+        with open(FINGERPRINTS_FILE, "r") as f:
+            previous = json.load(f)
+
+    years = np.arange(int(df["year"].min()), int(df["year"].max()) + 1)
+    year_range = [int(years[0]), int(years[-1])]
+    fingerprints = compute_fingerprints(df)
+    if previous.get("years") != year_range:
+        # Every capability is interpolated and extrapolated over the years of the whole dataset
+        changed = list(fingerprints)
+    else:
+        previous_fingerprints = previous.get("capabilities", {})
+        changed = [cap for cap, value in fingerprints.items() if previous_fingerprints.get(cap) != value]
+    if not changed and existing:
+        logger.info("Capability heights are up to date..")
+        return existing
+    logger.info(f"Recomputing {len(changed)} of {len(fingerprints)} capabilities..")
+
+    rows = prepare(df[df["capability"].isin(changed)])
+    heights = compute_heights(rows, years)
+    top_models = compute_top_models(rows)
+
+    benchmarks = df.groupby("capability", observed=True)["benchmark"].unique()
+    top_columns = ["model", "org", "benchmark", "score", "normalized_score", "date"]
+    grouped_top_models = {
+        key: group[top_columns].astype({"date": str}).to_dict("records")
+        for key, group in top_models.groupby(["slice", "capability", "year"], observed=True)
+    }
+
+    result = {}
+    for org_slice in SLICES:
+        result[org_slice] = {}
+        for capability in sorted(fingerprints):
+            if capability not in changed and capability in existing.get(org_slice, {}):
+                result[org_slice][capability] = existing[org_slice][capability]
+                continue
+
+            previous = existing.get(ALL, {}).get(capability)
+            metadata = previous or default_metadata(capability, sorted(benchmarks[capability]))
+            entry = {key: value for key, value in metadata.items() if key not in ("heights", "top_models")}
+            entry["heights"] = {}
+            entry["top_models"] = {}
+
+            if (org_slice, capability) in heights.index:
+                entry["heights"] = {str(year): float(h) for year, h in heights.loc[(org_slice, capability)].items()}
+            for year in years:
+                if (org_slice, capability, year) in grouped_top_models:
+                    entry["top_models"][str(year)] = grouped_top_models[(org_slice, capability, year)]
+
+            result[org_slice][capability] = entry
+
+    with open(CAPABILITY_HEIGHTS_FILE, "w") as f:
+        json.dump(result, f, indent=2, default=str)
+    FINGERPRINTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(FINGERPRINTS_FILE, "w") as f:
+        json.dump({"years": year_range, "capabilities": fingerprints}, f, indent=2, sort_keys=True)
+
+    return result
+
+
+if __name__ == "__main__":
+    build_capability_heights()
@@ -1,35 +1,195 @@
+import threading
 from pathlib import Path
 
 import pandas as pd
-from langchain_community.utilities import SQLDatabase
 from loguru import logger
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, text
 
+from dashboard.data.loader import loader
+from dashboard.data.store import data_version
 from dashboard.singleton import SingletonMeta
 
+TABLE = "scores"
+META_TABLE = "meta"
+
+# Column name -> SQLite type of the scores table
+COLUMNS = {
+    "model": "TEXT NOT NULL",
+    "benchmark": "TEXT NOT NULL",
+    "date": "TEXT",
+    "org": "TEXT",
+    "country": "TEXT",
+    "training_compute_flops": "REAL",
+    "score": "REAL",
+    "capability": "TEXT",
+    "year": "INTEGER",
+}
+KEY_COLUMNS = ["model", "benchmark"]
+# Bumped when the stored values of the same data change, so that databases synced before are synced again
+# (2: full precision scores instead of float32)
+ROW_FORMAT = "2"
+INDEXED_COLUMNS = ["benchmark", "capability", "year", "org", "country"]
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+BUSY_TIMEOUT = 30  # Seconds a connection waits for a lock held by a writer
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Open every connection in WAL mode, so that readers never block on the writer (and vice versa)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+    # The driver only begins transactions before writes, they are begun by `begin_transaction` instead
+    dbapi_connection.isolation_level = None
+
+
+def begin_transaction(conn) -> None:
+    """Begin every SQLAlchemy transaction in SQLite, reads included.
+
+    All queries of a connection, until it commits, rolls back or is closed, then read the same snapshot of the
+    database, even while a sync writes a new data version.
+    """
+    conn.exec_driver_sql("BEGIN")
+
+
+def create_sqlite_engine(path: Path) -> Engine:
+    """Create a pooled engine for a SQLite file, suited to many concurrent readers."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT},
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(engine, "begin", begin_transaction)
+    return engine
+
+
+def create_tables(engine: Engine) -> None:
+    """Create the scores and meta tables and the indexes used by the filters, if they do not exist."""
+    columns = ", ".join(f"{name} {sql_type}" for name, sql_type in COLUMNS.items())
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} "
+                f"({columns}, row_hash INTEGER NOT NULL, PRIMARY KEY ({', '.join(KEY_COLUMNS)}))"
+            )
+        )
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)"))
+        for column in INDEXED_COLUMNS:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_{column} ON {TABLE} ({column})"))
+
+
+def to_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Bring a frame to the columns of the scores table, one row per (model, benchmark).
+
+    Duplicate keys keep their best score. A hash of every row is added, so that unchanged rows can be skipped.
+    """
+    rows = df.reindex(columns=list(COLUMNS)).dropna(subset=KEY_COLUMNS)
+    rows = rows.sort_values("score", ascending=False, na_position="last").drop_duplicates(subset=KEY_COLUMNS)
+    if pd.api.types.is_datetime64_any_dtype(rows["date"]):
+        rows["date"] = rows["date"].dt.strftime("%Y-%m-%d")
+    rows = rows.astype(object).where(rows.notna(), None)
+    # SQLite integers are signed 64 bit
+    rows["row_hash"] = pd.util.hash_pandas_object(rows, index=False).to_numpy().view("int64")
+    return rows
+
 
 class Database(metaclass=SingletonMeta):
-    """Provide CSV data as a SQLite database."""
+    """Provide the benchmark data as a SQLite database."""
 
     DB_FILE = Path("cache/michelin.db")
 
     def __init__(self):
         logger.debug("Database object is being created..")
+        self.engine = None
         self.db = None
+        self.version = None  # Data version this process last synced to or found in the database
+        self.lock = threading.Lock()
+
+    def stored_version(self) -> str | None:
+        """Return the data version the database was last synced to, or None if it was synced in an older format."""
+        with self.engine.connect() as conn:
+            meta = dict(conn.execute(text(f"SELECT key, value FROM {META_TABLE}")).all())
+        if meta.get("row_format") != ROW_FORMAT:
+            return None
+        return meta.get("data_version")
+
+    def sync(self, df: pd.DataFrame, version: str) -> None:
+        """Upsert the rows that changed since the last sync and delete the rows that disappeared.
+
+        Args:
+            df (pd.DataFrame): the benchmark data, at the full precision of the source
+            version (str): data version of the frame, stamped into the meta table
+        """
+        rows = to_rows(df)
+        with self.engine.connect() as conn:
+            existing = pd.read_sql(text(f"SELECT model, benchmark, row_hash FROM {TABLE}"), conn)
+        existing = existing.astype({"row_hash": "int64"})
 
-    def load(self, df: pd.DataFrame) -> None:
-        database_exists = self.DB_FILE.is_file()
+        # Rows whose key and hash are both already stored are unchanged
+        merged = rows.merge(existing, on=[*KEY_COLUMNS, "row_hash"], how="left", indicator=True)
+        changed = merged.loc[merged["_merge"] == "left_only"].drop(columns="_merge")
+        removed = existing.merge(rows[KEY_COLUMNS], on=KEY_COLUMNS, how="left", indicator=True)
+        removed = removed.loc[removed["_merge"] == "left_only", KEY_COLUMNS]
 
-        engine = create_engine(f"sqlite:///{self.DB_FILE}")
+        names = [*COLUMNS, "row_hash"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names if name not in KEY_COLUMNS)
+        upsert = text(
+            f"INSERT INTO {TABLE} ({', '.join(names)}) VALUES ({', '.join(f':{name}' for name in names)}) "
+            f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}"
+        )
+        delete = text(f"DELETE FROM {TABLE} WHERE model = :model AND benchmark = :benchmark")
+        stamp = text(
+            f"INSERT INTO {META_TABLE} (key, value) VALUES (:key, :value) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+        )
 
-        # Load data into database if the database did not exists
-        if not database_exists:
-            df.to_sql("michelin", engine, index=False)
+        with self.engine.begin() as conn:
+            if len(changed):
+                conn.execute(upsert, changed.to_dict("records"))
+            if len(removed):
+                conn.execute(delete, removed.to_dict("records"))
+            conn.execute(stamp, [{"key": "data_version", "value": version}, {"key": "row_format", "value": ROW_FORMAT}])
 
-        self.db = SQLDatabase(engine=engine)
+        logger.info(f"Synced database to data version {version}: {len(changed)} upserted, {len(removed)} deleted")
 
-    def get_db(self) -> SQLDatabase:
+    def load(self, df: pd.DataFrame | None = None, version: str | None = None) -> None:
+        """Open the database and sync it with the data, if the data version changed.
+
+        Args:
+            df (pd.DataFrame | None): the benchmark data, loaded from the store if None. The compact dtypes of the
+                in-memory dataset (see `loader.DTYPES`) must not be used, as float32 scores would be stored as e.g.
+                56.900001525878906 instead of 56.9
+            version (str | None): data version of the frame, the current version of the store if None
+        """
+        version = version or data_version()
+        if version == self.version:
+            return
+
+        # Concurrent first requests must not each create an engine, nor sync the same version
+        with self.lock:
+            if self.engine is None:
+                engine = create_sqlite_engine(self.DB_FILE)
+                create_tables(engine)
+                self.engine = engine
+
+            if self.stored_version() == version:
+                logger.debug(f"Database is up to date with data version {version}")
+            else:
+                self.sync(df if df is not None else loader(typed=False), version)
+            self.version = version
+
+    def get_db(self):
         """Return instance of SQLDatabase."""
-        if not self.db:
+        if self.engine is None:
             raise AttributeError("Database has not been initialized yet.")
+        if self.db is None:
+            # langchain is heavy to import and only needed by the LLM features
+            from langchain_community.utilities import SQLDatabase
+
+            self.db = SQLDatabase(engine=self.engine)
         return self.db
@@ -0,0 +1,259 @@
+"""Cross-benchmark leaderboard of the models.
+
+The combined dataset is pivoted once into a dense model x benchmark matrix of scores (NaN where a model was not
+evaluated). Ranks and percentiles are computed per benchmark column with NumPy, so scores on different scales can be
+compared, and the aggregate ranking of a model is its mean percentile over the benchmarks it was evaluated on.
+
+When the data version changes, only the columns of the benchmarks whose rows changed are recomputed, using a
+fingerprint of the rows of every benchmark.
+"""
+
+import threading
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from dashboard.data.schema import SCHEMAS
+from dashboard.singleton import SingletonMeta
+
+COLUMNS = ["model", "benchmark", "score"]
+MODEL_COLUMNS = ["org", "country", "date"]
+MIN_BENCHMARKS = 3  # Models evaluated on fewer benchmarks are not ranked in the aggregate
+
+
+def higher_is_better(benchmarks: pd.Index) -> np.ndarray:
+    """Return whether a higher score is better for every benchmark, True for benchmarks without a schema."""
+    return np.array([SCHEMAS[name].higher_is_better if name in SCHEMAS else True for name in benchmarks])
+
+
+def compute_fingerprints(df: pd.DataFrame) -> pd.Series:
+    """Return a fingerprint of the rows of every benchmark."""
+    hashes = pd.util.hash_pandas_object(df[COLUMNS], index=False)
+    # Summing the row hashes (modulo 2**64) makes the fingerprint independent of the row order
+    return hashes.groupby(df["benchmark"].to_numpy()).sum()
+
+
+def pivot(df: pd.DataFrame, models: pd.Index, benchmarks: pd.Index) -> np.ndarray:
+    """Return the matrix of the best score of every (model, benchmark), NaN where there is none.
+
+    Args:
+        df (pd.DataFrame): rows with the columns `model`, `benchmark` and `score`
+        models (pd.Index): rows of the matrix, must contain all models of `df`
+        benchmarks (pd.Index): columns of the matrix, must contain all benchmarks of `df`
+
+    Returns:
+        np.ndarray: matrix of shape (len(models), len(benchmarks))
+    """
+    df = df.dropna(subset=["score"])
+    rows = models.get_indexer(df["model"])
+    cols = benchmarks.get_indexer(df["benchmark"])
+    scores = df["score"].to_numpy(dtype=float)
+
+    # Assigned from worst to best, so that the best of duplicate (model, benchmark) rows is written last
+    oriented = np.where(higher_is_better(benchmarks)[cols], scores, -scores)
+    order = np.argsort(oriented, kind="stable")
+
+    matrix = np.full((len(models), len(benchmarks)), np.nan)
+    matrix[rows[order], cols[order]] = scores[order]
+    return matrix
+
+
+def rank_columns(scores: np.ndarray, higher: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rank the models within every column of a score matrix.
+
+    Args:
+        scores (np.ndarray): matrix of shape (models, benchmarks), NaN where there is no score
+        higher (np.ndarray): whether a higher score is better, per column
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the ranks (1 is best, ties share the best rank) and the percentiles (100 is
+        best, 0 is worst), NaN where there is no score
+    """
+    missing = np.isnan(scores)
+    # Lower is better after orienting, missing scores sort last
+    oriented = np.where(higher[None, :], -scores, scores)
+    oriented[missing] = np.inf
+
+    order = np.argsort(oriented, axis=0, kind="stable")
+    sorted_scores = np.take_along_axis(oriented, order, axis=0)
+
+    # Rank of the first occurrence of every value, so that ties share it
+    positions = np.arange(len(scores))[:, None]
+    is_new = np.ones(sorted_scores.shape, dtype=bool)
+    is_new[1:] = sorted_scores[1:] != sorted_scores[:-1]
+    sorted_ranks = np.maximum.accumulate(np.where(is_new, positions, 0), axis=0) + 1.0
+
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+    ranks[missing] = np.nan
+
+    counts = (~missing).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentiles = np.where(counts > 1, (counts - ranks) / (counts - 1) * 100, 100.0)
+    percentiles[missing] = np.nan
+    return ranks, percentiles
+
+
+@dataclass(frozen=True)
+class LeaderboardState:
+    """Matrices of one version of the leaderboard, never modified once published."""
+
+    models: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=MODEL_COLUMNS))
+    benchmarks: pd.Index = field(default_factory=lambda: pd.Index([]))
+    fingerprints: dict = field(default_factory=dict)
+    scores: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    ranks: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    percentiles: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+
+
+def carry_over(matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Reindex a matrix to new models and benchmarks, NaN where a row or column did not exist."""
+    result = np.full((len(rows), len(cols)), np.nan)
+    kept_rows, kept_cols = rows >= 0, cols >= 0
+    result[np.ix_(kept_rows, kept_cols)] = matrix[np.ix_(rows[kept_rows], cols[kept_cols])]
+    return result
+
+
+def recompute(state: LeaderboardState, df: pd.DataFrame, benchmarks: pd.Index) -> None:
+    """Recompute the scores, ranks and percentiles of some benchmarks from their rows, in a state not yet published."""
+    if len(benchmarks) == 0:
+        return
+    benchmarks = pd.Index(benchmarks)
+    cols = state.benchmarks.get_indexer(benchmarks)
+    scores = pivot(df, state.models.index, benchmarks)
+    ranks, percentiles = rank_columns(scores, higher_is_better(benchmarks))
+    state.scores[:, cols] = scores
+    state.ranks[:, cols] = ranks
+    state.percentiles[:, cols] = percentiles
+
+
+class Leaderboard(metaclass=SingletonMeta):
+    """Provide the model x benchmark matrix with ranks and percentiles, kept up to date per data version.
+
+    Updates build a new `LeaderboardState` and swap it in, so that readers in other threads always see a consistent
+    state without taking the lock.
+    """
+
+    def __init__(self):
+        logger.debug("Leaderboard object is being created..")
+        self.version = None
+        self.state = LeaderboardState()
+        self.lock = threading.Lock()
+
+    @property
+    def models(self) -> pd.DataFrame:
+        return self.state.models
+
+    @property
+    def benchmarks(self) -> pd.Index:
+        return self.state.benchmarks
+
+    def get(self, df: pd.DataFrame, version: str) -> "Leaderboard":
+        """Return the leaderboard of a dataset.
+
+        Args:
+            df (pd.DataFrame): the dataset, only used when the data version changed
+            version (str): data version of the dataset, so that the leaderboard is never cached under another version
+
+        Returns:
+            Leaderboard: the up to date leaderboard
+        """
+        if version != self.version:
+            with self.lock:
+                # Another thread may have refreshed it while this one waited
+                if version != self.version:
+                    self.state = self.refreshed(self.state, df)
+                    self.version = version
+        return self
+
+    @staticmethod
+    def refreshed(state: LeaderboardState, df: pd.DataFrame) -> LeaderboardState:
+        """Return the state brought up to date with a dataset, recomputing only the benchmarks whose rows changed."""
+        df = df.dropna(subset=COLUMNS)
+        fingerprints = compute_fingerprints(df).to_dict()
+        changed = pd.Index([name for name, value in fingerprints.items() if state.fingerprints.get(name) != value])
+        removed = state.benchmarks.difference(list(fingerprints))
+
+        models = df.groupby("model", observed=True)[MODEL_COLUMNS].first().sort_index()
+        benchmarks = pd.Index(sorted(fingerprints))
+        if len(changed) == 0 and len(removed) == 0 and models.index.equals(state.models.index):
+            return replace(state, models=models)
+        logger.info(f"Recomputing the leaderboard of {len(changed)} of {len(benchmarks)} benchmarks..")
+
+        # Carry over the unchanged columns, the rows of new models are empty in them
+        rows = state.models.index.get_indexer(models.index)
+        cols = state.benchmarks.get_indexer(benchmarks)
+        new_state = LeaderboardState(
+            models=models,
+            benchmarks=benchmarks,
+            fingerprints=fingerprints,
+            scores=carry_over(state.scores, rows, cols),
+            ranks=carry_over(state.ranks, rows, cols),
+            percentiles=carry_over(state.percentiles, rows, cols),
+        )
+        recompute(new_state, df[df["benchmark"].isin(changed)], changed)
+        return new_state
+
+    def update_benchmark(self, benchmark: str, rows: pd.DataFrame) -> None:
+        """Replace the rows of a single benchmark and recompute its column.
+
+        Args:
+            benchmark (str): name of the benchmark, must already be in the leaderboard
+            rows (pd.DataFrame): all rows of the benchmark, with the columns `model` and `score`; their models must
+                already be in the leaderboard
+        """
+        with self.lock:
+            state = self.state
+            rows = rows.assign(benchmark=benchmark).dropna(subset=COLUMNS)
+            rows = rows[rows["model"].isin(state.models.index)]
+            new_state = replace(
+                state,
+                fingerprints={**state.fingerprints, benchmark: compute_fingerprints(rows).get(benchmark, 0)},
+                scores=state.scores.copy(),
+                ranks=state.ranks.copy(),
+                percentiles=state.percentiles.copy(),
+            )
+            recompute(new_state, rows, pd.Index([benchmark]))
+            self.state = new_state
+
+    def ranking(self, benchmarks: list[str] | None = None, min_benchmarks: int = MIN_BENCHMARKS) -> pd.DataFrame:
+        """Return the aggregate ranking of the models over some benchmarks.
+
+        Args:
+            benchmarks (list[str] | None): benchmarks to aggregate, all if None
+            min_benchmarks (int): models evaluated on fewer of the benchmarks are left out, capped to the number of
+                benchmarks, so that a selection of one or two benchmarks still ranks every model evaluated on them
+
+        Returns:
+            pd.DataFrame: models sorted by rank, with their org, country and date, their mean percentile
+            (`percentile`), the number of benchmarks they were evaluated on (`benchmarks`), and their percentile on
+            every benchmark
+        """
+        state = self.state
+        cols = np.arange(len(state.benchmarks)) if benchmarks is None else state.benchmarks.get_indexer(benchmarks)
+        cols = cols[cols >= 0]
+        percentiles = state.percentiles[:, cols]
+
+        evaluated = ~np.isnan(percentiles)
+        counts = evaluated.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(evaluated, percentiles, 0).sum(axis=1) / counts
+        ranked = counts >= max(min(min_benchmarks, len(cols)), 1)
+
+        result = state.models[ranked].copy()
+        result["percentile"] = mean[ranked]
+        result["benchmarks"] = counts[ranked]
+        result = pd.concat(
+            [result, pd.DataFrame(percentiles[ranked], index=result.index, columns=state.benchmarks[cols])], axis=1
+        )
+        result = result.sort_values(["percentile", "benchmarks"], ascending=False)
+        result.insert(0, "rank", result["percentile"].rank(method="min", ascending=False).astype(int))
+        return result.rename_axis("model").reset_index()
+
+    def coverage(self) -> pd.Series:
+        """Return the number of models evaluated on every benchmark, in descending order."""
+        state = self.state
+        counts = (~np.isnan(state.scores)).sum(axis=0)
+        return pd.Series(counts, index=state.benchmarks).sort_values(ascending=False)
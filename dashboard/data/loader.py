@@ -4,41 +4,66 @@ from pathlib import Path
 import pandas as pd
 from loguru import logger
 
+from dashboard.data.store import read_dataset
+
 URL = "https://raw.githubusercontent.com/plotly/datasets/master/michelin_by_Jerry_Ng.csv"
 CACHE_FILE  = str(Path(__file__).resolve().parents[2] / "data" / "processed" / "combined_benchmarks_cleaned.csv")
+RAW_FILE = Path(CACHE_FILE).with_name("combined_benchmarks.csv")
 
+# Reasoning effort ('_high') or thinking budget ('_16K', ' (16K thinking)') at the end of a model name
+REASONING_EFFORT_PATTERN = (
+    r"(?:_(?P<level>minimal|low|medium|high)|_(?P<budget>\d+[kK])|\s*\((?P<thinking>\d+[kK]) thinking\))$"
+)
 
+# Compact dtypes of the columns of the combined dataset, the string columns repeat a few dozen distinct values
+DTYPES = {
+    "model": "category",
+    "benchmark": "category",
+    "org": "category",
+    "country": "category",
+    "capability": "category",
+    "reasoning_effort": "category",
+    "training_compute_flops": "float32",
+    "score": "float32",
+    "year": "int16",
+}
 
 
-def loader() -> pd.DataFrame:
-    """Load data.
 
-    The data is either retrieved from cache, or fetched from Github if not found in cache.
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the columns of the combined dataset to compact dtypes (see `DTYPES`), and parse the dates.
+
+    Args:
+        df (pd.DataFrame): combined dataset, possibly restricted to some of its columns
 
     Returns:
-        pd.DataFrame: CSV data as a pandas DataFrame
+        pd.DataFrame: dataset with compact dtypes
     """
-    path = Path(CACHE_FILE)
+    before = df.memory_usage(deep=True).sum()
 
-    if not path.is_file():
-        logger.info("Fetching data from source..")
-        fetch_data(path)
-    else:
-        logger.info("Loading data from cache..")
-    df = pd.read_csv(CACHE_FILE)
-
-    logger.info("Loading data into SQLite database..")
+    dtypes = {column: dtype for column, dtype in DTYPES.items() if column in df.columns}
+    if "year" in dtypes and df["year"].isna().any():
+        dtypes["year"] = "Int16"  # Nullable, as NaN does not fit in int16
+    df = df.astype(dtypes)
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
 
+    after = df.memory_usage(deep=True).sum()
+    logger.info(f"Memory usage of the dataset: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
     return df
 
 
-
-
-## The below function needs to be ammended
-def load_data() -> pd.DataFrame:
+def loader(columns: list[str] | None = None, typed: bool = True) -> pd.DataFrame:
     """Load data.
 
-    The data is either retrieved from cache, or fetched from Github if not found in cache.
+    The data is read memory-mapped from the columnar store, which is (re)compiled from the CSV source when it changed.
+    The CSV is fetched from Github if not found in cache.
+
+    Args:
+        columns (list[str] | None): columns to load, all columns if None
+        typed (bool): if True, the columns are converted to compact dtypes (see `apply_dtypes`), otherwise they keep
+            the full precision of the source
 
     Returns:
         pd.DataFrame: CSV data as a pandas DataFrame
@@ -49,16 +74,35 @@ def load_data() -> pd.DataFrame:
         logger.info("Fetching data from source..")
         fetch_data(path)
     else:
-        logger.info("Loading data from cache..")
+        logger.info("Loading data from the columnar store..")
+    df = read_dataset(path.stem, columns=columns)
+    if typed:
+        df = apply_dtypes(df)
+
+    return df
 
-    df = pd.read_csv(path)
+
+
+
+def load_data() -> pd.DataFrame:
+    """Load and clean the raw combined dataset.
+
+    Returns:
+        pd.DataFrame: cleaned data as a pandas DataFrame
+    """
+    logger.info("Loading raw data..")
+    df = pd.read_csv(RAW_FILE, low_memory=False)
 
     df = clean_data(df)
 
-    df = add_features(df)
+    return df
 
-    logger.info("Loading data into SQLite database..")
 
+def write_cleaned_data() -> pd.DataFrame:
+    """Clean the raw combined dataset and write it to the cache file, from which the columnar store is compiled."""
+    df = load_data()
+    df.to_csv(CACHE_FILE, index=False)
+    logger.info(f"Wrote {len(df)} cleaned rows to {CACHE_FILE}")
     return df
 
 
@@ -73,98 +117,51 @@ def fetch_data(path: Path) -> None:
     urllib.request.urlretrieve(URL, path)
 
 
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean the raw combined dataset.
 
-
-def add_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add features to the dataframe.
+    Every step is a vectorized column operation, so the cost grows linearly with the number of rows.
 
     Args:
-        df (pd.DataFrame): original dataframe as retrieved from Github
+        df (pd.DataFrame): raw combined dataset
 
     Returns:
-        pd.DataFrame: dataset with features
+        pd.DataFrame: dataset with one row per (model, benchmark)
     """
-    df = add_award_size_feature(df)
-    df = add_city_country_features(df)
-    df = normalize_price(df)
-    df = add_value_feature(df)
-    return df
-
-
-def add_award_size_feature(df: pd.DataFrame) -> pd.DataFrame:
-    """Add a size based to be used for maps based on the value of 'Award'."""
+    df = df.copy()
 
-    def size_mapping(award):
-        if award == "3 Stars":
-            return 30
-        elif award == "2 Stars":
-            return 15
-        elif award == "1 Star":
-            return 10
-        elif award == "Bib Gourmand":
-            return 5
-        else:
-            return 2
+    # Coerce types, unparseable values become missing
+    df["model"] = df["model"].astype("string").str.strip().replace("", pd.NA)
+    df["score"] = pd.to_numeric(df["score"], errors="coerce")
+    df["training_compute_flops"] = pd.to_numeric(df["training_compute_flops"], errors="coerce")
+    dates = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+    df["date"] = dates.dt.strftime("%Y-%m-%d")
 
-    df["Award (Map Size)"] = df["Award"].apply(size_mapping)
-    return df
-
-
-def add_city_country_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add 'City' and 'Country' features based on the column 'Location'."""
+    df = df[df["model"].notna() & dates.notna() & df["score"].notna()]
 
-    df[["City", "Country"]] = df["Location"].str.split(", ", n=1, expand=True)
+    df = normalize_reasoning_effort(df)
+    df["year"] = dates.loc[df.index].dt.year.astype(int)
 
-    # Correct for locations with the same value for City and Country (e.g. Singapore)
-    df.loc[df["Country"].isnull(), "Country"] = df["Location"]
-
-    return df
+    # Keep the best score of every (model, benchmark), in the original row order
+    df = df.sort_values("score", ascending=False, kind="stable").drop_duplicates(subset=["model", "benchmark"])
+    return df.sort_index().reset_index(drop=True)
 
 
-def normalize_price(df: pd.DataFrame) -> pd.DataFrame:
-    """Add column 'Price (normalized)'.
+def normalize_reasoning_effort(df: pd.DataFrame) -> pd.DataFrame:
+    """Move the reasoning effort or thinking budget of a model variant into the column 'reasoning_effort'.
 
-    Based on the length of the string.
+    Variants are spelled as a suffix ('o3-2025-04-16_high', 'claude-sonnet-4-20250514_16K') or in parentheses
+    ('gemini-2.5-flash-preview-04-17 (16K thinking)'). The model name is normalized to the suffix spelling, so that
+    both spellings of a variant are deduplicated together.
     """
+    groups = df["model"].str.extract(REASONING_EFFORT_PATTERN)
+    budget = groups["budget"].fillna(groups["thinking"]).str.upper()
+    effort = groups["level"].fillna(budget)
 
-    def price_mapping(price):
-        if pd.isna(price):
-            return price
-
-        length = len(price)
-
-        if length == 1:
-            return "Budget-Friendly"
-        elif length == 2:
-            return "Moderate"
-        elif length == 3:
-            return "Premium"
-        elif length == 4:
-            return "Luxury"
-        raise ValueError("Unknown price")
-
-    df["Price (normalized)"] = df["Price"].apply(price_mapping)
+    base = df["model"].str.replace(REASONING_EFFORT_PATTERN, "", regex=True)
+    df = df.assign(model=base.where(effort.isna(), base + "_" + effort), reasoning_effort=effort)
     return df
 
 
-def add_value_feature(df: pd.DataFrame) -> pd.DataFrame:
-    """Add 'value feature'. Based on the 'price' and 'award' column.
-
-    Higher Award at Lower Price = Better Value
-
-    Args:
-        df (pd.DataFrame): dataframe (including column 'Price (normalized)' and 'Award')
-
-    Returns:
-        pd.DataFrame: dataframe with added feature.
-    """
-    price_mapping = {"Budget-Friendly": 1, "Moderate": 2, "Premium": 3, "Luxury": 4}
-    award_mapping = {"Selected Restaurants": 1, "Bib Gourmand": 2, "1 Star": 3, "2 Stars": 4, "3 Stars": 5}
-
-    df["Price Score"] = df["Price (normalized)"].map(price_mapping)
-    df["Award Score"] = df["Award"].map(award_mapping)
-
-    # Create a 'Value' column: Higher Award at Lower Price = Better Value
-    df["Value"] = (df["Award Score"] / df["Price Score"]).round(1)
-
-    return df
+if __name__ == "__main__":
+    write_cleaned_data()
@@ -0,0 +1,99 @@
+"""Normalize the Epoch benchmark CSV files into one long table.
+
+Every file is read with the columns, dtypes and date format declared by its schema (see `dashboard.data.schema`), and
+renamed to the column names of the combined dataset. The score is then normalized to [0, 1], higher is better, in a
+single vectorized pass over the concatenated table, using per-benchmark parameters looked up by category code.
+
+Adding a benchmark only requires a `BenchmarkSchema` entry.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from dashboard.data.schema import DATE_COLUMN, SCHEMAS, SCHEMAS_BY_FILE, BenchmarkSchema
+
+EPOCH_DIR = Path(__file__).resolve().parents[2] / "data" / "epoch_benchmark_data"
+
+LONG_COLUMNS = ["benchmark", "model", "date", "org", "country", "training_compute_flops", "score", "normalized_score"]
+
+
+def read_benchmark_file(schema: BenchmarkSchema, path: str) -> pd.DataFrame:
+    """Read the columns declared by the schema of a single benchmark CSV file."""
+    df = pd.read_csv(path, usecols=schema.columns, dtype=schema.dtypes)
+    df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN], format=schema.date_format, errors="coerce")
+    df = df.rename(columns=schema.rename)
+    df.insert(0, "benchmark", schema.name)
+    return df
+
+
+def normalize_scores(df: pd.DataFrame) -> pd.Series:
+    """Return the scores of a long table normalized to [0, 1], where higher is better.
+
+    Args:
+        df (pd.DataFrame): long table with a categorical 'benchmark' column and a 'score' column
+
+    Returns:
+        pd.Series: the normalized scores
+    """
+    schemas = [SCHEMAS[name] for name in df["benchmark"].cat.categories]
+    codes = df["benchmark"].cat.codes.to_numpy()
+    scale = np.array([np.nan if schema.scale is None else schema.scale for schema in schemas])[codes]
+    higher_is_better = np.array([schema.higher_is_better for schema in schemas])[codes]
+
+    score = df["score"].to_numpy(dtype=float)
+    grouped = df.groupby("benchmark", observed=False)["score"]
+    low = grouped.transform("min").to_numpy(dtype=float)
+    high = grouped.transform("max").to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.where(np.isnan(scale), (score - low) / (high - low), score / scale)
+    normalized = np.where(higher_is_better, normalized, 1 - normalized)
+    return pd.Series(np.clip(normalized, 0, 1), index=df.index, name="normalized_score")
+
+
+def load_long_table(data_dir: Path | None = None, max_workers: int | None = 1) -> pd.DataFrame:
+    """Load all benchmark CSV files into one long table with normalized scores.
+
+    Only the columns declared by the schema of each benchmark are read, so free-text columns such as 'Notes' are never
+    parsed. The files are parsed serially by default, as this runs on the request path of a threaded server, where
+    forking a process pool is unsafe. Offline builds can parse them in parallel with `max_workers`, in processes
+    started with `spawn`.
+
+    Args:
+        data_dir (Path | None): directory with the benchmark CSV files, `EPOCH_DIR` if None
+        max_workers (int | None): number of worker processes, the number of CPUs if None, serial if 1
+
+    Returns:
+        pd.DataFrame: long table with the columns `LONG_COLUMNS`
+    """
+    data_dir = EPOCH_DIR if data_dir is None else data_dir
+    jobs = []
+    for file in sorted(os.listdir(data_dir)):
+        if not file.endswith(".csv"):
+            continue
+        if file not in SCHEMAS_BY_FILE:
+            logger.warning(f"No schema registered for '{file}', skipping..")
+            continue
+        jobs.append((SCHEMAS_BY_FILE[file], os.path.join(data_dir, file)))
+
+    if not jobs:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    if max_workers == 1:
+        dataframes = [read_benchmark_file(schema, path) for schema, path in jobs]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            dataframes = list(executor.map(read_benchmark_file, *zip(*jobs)))
+
+    df = pd.concat(dataframes, ignore_index=True)
+    # Categories differ per file, so they are unified after concatenation
+    df = df.astype({"benchmark": "category", "org": "category", "country": "category"})
+    df["normalized_score"] = normalize_scores(df)
+    return df[LONG_COLUMNS]
@@ -0,0 +1,40 @@
+"""Partition index over the dataset.
+
+For every partition column, the index maps each value to the positions of its rows, so that selecting the rows of a
+value is a `take` proportional to the size of the result instead of a boolean mask over the whole dataset.
+"""
+
+from collections.abc import Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+PARTITION_COLUMNS = ["country", "org", "benchmark", "capability", "year"]
+
+EMPTY = np.array([], dtype=np.intp)
+
+
+class PartitionIndex:
+    """Row positions of every value of the partition columns of a frame."""
+
+    def __init__(self, df: pd.DataFrame, columns: list[str] = PARTITION_COLUMNS):
+        self.df = df
+        self.partitions = {
+            column: df.groupby(column, observed=True, sort=False).indices for column in columns if column in df.columns
+        }
+
+    def covers(self, df: pd.DataFrame) -> bool:
+        """Return True if the index was built over this very frame."""
+        return df is self.df
+
+    def positions(self, column: str, value: Hashable | Iterable[Hashable]) -> np.ndarray:
+        """Return the sorted row positions of a value, or of any of several values."""
+        partition = self.partitions[column]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            parts = [partition[v] for v in value if v in partition]
+            return np.sort(np.concatenate(parts)) if parts else EMPTY
+        return partition.get(value, EMPTY)
+
+    def select(self, column: str, value: Hashable | Iterable[Hashable]) -> pd.DataFrame:
+        """Return the rows of a value, or of any of several values."""
+        return self.df.take(self.positions(column, value))
@@ -0,0 +1,248 @@
+"""Schemas of the Epoch benchmark CSV files in `data/epoch_benchmark_data`."""
+
+from dataclasses import dataclass
+
+MODEL_COLUMN = "Model version"
+DATE_COLUMN = "Release date"
+ORG_COLUMN = "Organization"
+COUNTRY_COLUMN = "Country"
+COMPUTE_COLUMN = "Training compute (FLOP)"
+
+# Names used for the columns in the combined dataset
+COMBINED_COLUMNS = {
+    MODEL_COLUMN: "model",
+    DATE_COLUMN: "date",
+    ORG_COLUMN: "org",
+    COUNTRY_COLUMN: "country",
+    COMPUTE_COLUMN: "training_compute_flops",
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkSchema:
+    """Describe which columns of a benchmark CSV are used, how they are typed and how the score is normalized.
+
+    The score is divided by `scale` to bring it to [0, 1]. Unbounded scores (Elo ratings, time horizons, indexes) have
+    no scale and are min-max normalized over the benchmark instead.
+    """
+
+    name: str
+    title: str
+    file: str
+    score_column: str
+    description: str = ""
+    scale: float | None = 1.0
+    higher_is_better: bool = True
+    date_format: str = "%Y-%m-%d"
+
+    @property
+    def columns(self) -> list[str]:
+        """Columns to read from the CSV file."""
+        return [MODEL_COLUMN, self.score_column, DATE_COLUMN, ORG_COLUMN, COUNTRY_COLUMN, COMPUTE_COLUMN]
+
+    @property
+    def dtypes(self) -> dict[str, str]:
+        """Explicit dtypes of the columns read from the CSV file."""
+        return {
+            MODEL_COLUMN: "string",
+            self.score_column: "float64",
+            DATE_COLUMN: "string",
+            ORG_COLUMN: "category",
+            COUNTRY_COLUMN: "category",
+            COMPUTE_COLUMN: "float64",
+        }
+
+    @property
+    def rename(self) -> dict[str, str]:
+        """Mapping of CSV column names to the names used in the combined dataset."""
+        return {**COMBINED_COLUMNS, self.score_column: "score"}
+
+
+SCHEMAS = {
+    schema.name: schema
+    for schema in [
+        BenchmarkSchema(
+            "adversarial_nli",
+            "ANLI",
+            "adversarial_nli_external.csv",
+            "Score",
+            description=(
+                "The Adversarial NLI (ANLI) dataset is a crowdsourced benchmark for natural language inference that "
+                "emphasizes model robustness. Human annotators iteratively created deceptive examples designed to "
+                "fool existing models, across three rounds (R1, R2, R3) of increasing difficulty."
+            ),
+        ),
+        BenchmarkSchema(
+            "aider_polyglot",
+            "Aider Polyglot",
+            "aider_polyglot_external.csv",
+            "Percent correct",
+            description=(
+                "The Aider Polyglot benchmark evaluates LLMs on their ability to assist in code editing across "
+                "multiple programming languages. It uses 225 challenging coding exercises from Exercism in C++, Go, "
+                "Java, JavaScript, Python, and Rust. Models are tasked with editing code to pass test suites, "
+                "simulating real-world AI-assisted development scenarios."
+            ),
+            scale=100,
+        ),
+        BenchmarkSchema(
+            "arc_agi",
+            "ARC AGI",
+            "arc_agi_external.csv",
+            "Score",
+            description=(
+                "The ARC-AGI benchmark, developed by François Chollet, is a test of core intelligence focusing on "
+                "abstraction and reasoning rather than memorization. It consists of grid-based puzzles where models "
+                "must infer rules from few examples and apply them to novel test cases."
+            ),
+        ),
+        BenchmarkSchema(
+            "arc_ai2",
+            "ARC AI2",
+            "arc_ai2_external.csv",
+            "Challenge score",
+            description=(
+                "The ARC Challenge, developed by the Allen Institute for AI (AI2), assesses reasoning with "
+                "grade-school science questions. The Challenge score covers the harder questions that simple "
+                "retrieval and co-occurrence methods fail to answer."
+            ),
+        ),
+        BenchmarkSchema(
+            "balrog",
+            "Balrog",
+            "balrog_external.csv",
+            "Average progress",
+            description=(
+                "BALROG evaluates the agentic capabilities of LLMs and VLMs on long-horizon interactive tasks. It "
+                "uses BabyAI, Crafter, TextWorld, BabaIsAI, MiniHack, and NetHack to assess reasoning, planning, and "
+                "execution in game-like environments."
+            ),
+        ),
+        BenchmarkSchema(
+            "bbh",
+            "BBH",
+            "bbh_external.csv",
+            "Average",
+            description=(
+                "BIG-Bench Hard (BBH) is a subset of BIG-Bench with 23 tasks where language models initially "
+                "performed below average human raters. It spans navigation, logical deduction, multi-step arithmetic, "
+                "and causal reasoning."
+            ),
+        ),
+        BenchmarkSchema(
+            "bool_q",
+            "BoolQ",
+            "bool_q_external.csv",
+            "Score",
+            description=(
+                "BoolQ is a question answering dataset of yes/no questions derived from Google searches and Wikipedia "
+                "passages. It tests reading comprehension and factual inference on naturally phrased questions."
+            ),
+        ),
+        BenchmarkSchema(
+            "cad_eval",
+            "CAD Eval",
+            "cad_eval_external.csv",
+            "Overall pass (%)",
+            description=(
+                "The Text to CAD Eval benchmark assesses LLMs on generating solid CAD models via OpenSCAD code from "
+                "text prompts. Generated models are rendered and compared against reference models using geometric "
+                "metrics."
+            ),
+        ),
+        BenchmarkSchema(
+            "common_sense_qa_2",
+            "CommonsenseQA2",
+            "common_sense_qa_2_external.csv",
+            "Score",
+            description=(
+                "CommonsenseQA 2.0 evaluates commonsense reasoning with 14,000 yes/no questions spanning 1,417 "
+                "ConceptNet topics, constructed adversarially to minimize shortcuts and memorization."
+            ),
+        ),
+        BenchmarkSchema(
+            "cybench",
+            "Cybench",
+            "cybench_external.csv",
+            "Unguided % Solved",
+            description=(
+                "Cybench evaluates the cybersecurity capabilities of AI agents on professional-level CTF tasks. Tasks "
+                "are attempted unguided (autonomous exploration) and subtask-guided (step-by-step prompting)."
+            ),
+        ),
+        BenchmarkSchema("deepresearchbench", "DeepResearch Bench", "deepresearchbench_external.csv", "Average score"),
+        BenchmarkSchema(
+            "epoch_capabilities_index",
+            "Epoch Capabilities Index",
+            "epoch_capabilities_index.csv",
+            "ECI Score",
+            scale=None,
+        ),
+        BenchmarkSchema(
+            "factorio_learning_environment",
+            "Factorio Learning Environment",
+            "factorio_learning_environment_external.csv",
+            "Production score",
+            scale=None,
+        ),
+        BenchmarkSchema("fictionlivebench", "Fiction.LiveBench", "fictionlivebench_external.csv", "120k token score"),
+        BenchmarkSchema("frontiermath", "FrontierMath", "frontiermath.csv", "Best score (across scorers)"),
+        BenchmarkSchema(
+            "frontiermath_tier_4",
+            "FrontierMath Tier 4",
+            "frontiermath_tier_4.csv",
+            "Best score (across scorers)",
+        ),
+        BenchmarkSchema("geobench", "GeoBench", "geobench_external.csv", "ACW Avg Score", scale=5000),
+        BenchmarkSchema("gpqa_diamond", "GPQA Diamond", "gpqa_diamond.csv", "Best score (across scorers)"),
+        BenchmarkSchema("gsm8k", "GSM8K", "gsm8k_external.csv", "EM"),
+        BenchmarkSchema("gso", "GSO", "gso_external.csv", "Score OPT@1"),
+        BenchmarkSchema("hella_swag", "HellaSwag", "hella_swag_external.csv", "Overall accuracy"),
+        BenchmarkSchema("lambada", "LAMBADA", "lambada_external.csv", "Score"),
+        BenchmarkSchema(
+            "lech_mazur_writing",
+            "Lech Mazur Writing",
+            "lech_mazur_writing_external.csv",
+            "Mean score",
+            scale=10,
+        ),
+        BenchmarkSchema("live_bench", "LiveBench", "live_bench_external.csv", "Global average", scale=100),
+        BenchmarkSchema("math_level_5", "MATH Level 5", "math_level_5.csv", "Best score (across scorers)"),
+        BenchmarkSchema(
+            "metr_time_horizons",
+            "METR Time Horizons",
+            "metr_time_horizons_external.csv",
+            "Time horizon",
+            scale=None,
+        ),
+        BenchmarkSchema("mmlu", "MMLU", "mmlu_external.csv", "EM"),
+        BenchmarkSchema("open_book_qa", "OpenBookQA", "open_book_qa_external.csv", "Accuracy"),
+        BenchmarkSchema("os_universe", "OSUniverse", "os_universe_external.csv", "Weighted Score"),
+        BenchmarkSchema("os_world", "OSWorld", "os_world_external.csv", "Score", scale=100),
+        BenchmarkSchema(
+            "otis_mock_aime_2024_2025",
+            "OTIS Mock AIME 2024-2025",
+            "otis_mock_aime_2024_2025.csv",
+            "Best score (across scorers)",
+        ),
+        BenchmarkSchema("piqa", "PIQA", "piqa_external.csv", "Score"),
+        BenchmarkSchema("science_qa", "ScienceQA", "science_qa_external.csv", "Score"),
+        BenchmarkSchema("simplebench", "SimpleBench", "simplebench_external.csv", "Score (AVG@5)"),
+        BenchmarkSchema("superglue", "SuperGLUE", "superglue_external.csv", "Score"),
+        BenchmarkSchema(
+            "swe_bench_verified",
+            "SWE-bench Verified",
+            "swe_bench_verified.csv",
+            "Best score (across scorers)",
+        ),
+        BenchmarkSchema("terminalbench", "Terminal-Bench", "terminalbench_external.csv", "Accuracy mean"),
+        BenchmarkSchema("the_agent_company", "TheAgentCompany", "the_agent_company_external.csv", "% Score"),
+        BenchmarkSchema("trivia_qa", "TriviaQA", "trivia_qa_external.csv", "EM"),
+        BenchmarkSchema("vpct", "VPCT", "vpct_external.csv", "Correct"),
+        BenchmarkSchema("webdev_arena", "WebDev Arena", "webdev_arena_external.csv", "Arena Score", scale=None),
+        BenchmarkSchema("weirdml", "WeirdML", "weirdml_external.csv", "Average"),
+        BenchmarkSchema("wino_grande", "WinoGrande", "wino_grande_external.csv", "Accuracy"),
+    ]
+}
+
+SCHEMAS_BY_FILE = {schema.file: schema for schema in SCHEMAS.values()}
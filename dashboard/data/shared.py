@@ -0,0 +1,116 @@
+"""Shared-memory dataset plane.
+
+The dataset is published once per data version as an uncompressed Arrow IPC file in shared memory (`/dev/shm` when
+available). Every worker memory-maps that file read-only, so the pages of the numeric columns are shared between all
+worker processes instead of each worker holding its own unpickled copy. String and categorical columns are still
+converted to pandas objects in every worker, see `attach`.
+
+A new version is written to a temporary file and renamed into place, which makes the swap atomic. Workers switch to
+the new version on their next access; mappings of an old version stay valid until the worker drops them.
+"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from dashboard.data.loader import loader
+from dashboard.data.store import read_manifest
+from dashboard.singleton import SingletonMeta
+
+SHM_ROOT = Path("/dev/shm")
+SHARED_DIR = (SHM_ROOT if SHM_ROOT.is_dir() else Path(__file__).resolve().parents[2] / "cache") / "ai-dashboard"
+
+
+def to_arrow(series: pd.Series) -> pa.Array:
+    """Convert a column to Arrow.
+
+    Numeric columns keep NaN as a value instead of converting it to a null, so that they can be converted back to
+    pandas without a copy.
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        return pa.array(series.to_numpy(), from_pandas=False)
+    return pa.array(series, from_pandas=True)
+
+
+def dataset_path(version: str) -> Path:
+    """Return the path of the shared dataset of a data version."""
+    return SHARED_DIR / f"dataset-{version}.arrow"
+
+
+def path_version(path: Path) -> str:
+    """Return the data version of a shared dataset path, see `dataset_path`."""
+    return path.stem.removeprefix("dataset-")
+
+
+def publish(df: pd.DataFrame, version: str) -> Path:
+    """Publish a dataset into shared memory.
+
+    Args:
+        df (pd.DataFrame): the dataset
+        version (str): data version of the dataset
+
+    Returns:
+        Path: path of the published file
+    """
+    SHARED_DIR.mkdir(parents=True, exist_ok=True)
+    path = dataset_path(version)
+    table = pa.table({column: to_arrow(df[column]) for column in df.columns})
+
+    # Every publisher, thread or process, writes its own file, the rename makes whichever finishes last win atomically
+    with tempfile.NamedTemporaryFile(dir=SHARED_DIR, prefix=f"{path.stem}.", suffix=".tmp", delete=False) as f:
+        tmp_path = Path(f.name)
+    with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    tmp_path.replace(path)
+    logger.info(f"Published dataset version {version} to {path}")
+
+    # Only the published version and the current version of the store are kept, so that a worker lagging behind and
+    # publishing an older version does not remove the newer one. Workers that still map a removed version keep their
+    # mapping, the file is only unlinked
+    keep = {version, read_manifest().get("version")}
+    for old_path in SHARED_DIR.glob("dataset-*.arrow"):
+        if path_version(old_path) not in keep:
+            old_path.unlink(missing_ok=True)
+
+    return path
+
+
+def attach(path: Path) -> pd.DataFrame:
+    """Memory-map a published dataset read-only.
+
+    Numeric columns without nulls are converted to pandas without a copy, so they stay backed by the shared pages.
+    String and categorical columns are materialized as Python objects and categoricals in the memory of every worker,
+    as the pages and callbacks rely on their pandas dtypes (`pd.ArrowDtype` columns would stay shared, but behave
+    differently in `groupby`, `.str` and `.cat`).
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedDataset(metaclass=SingletonMeta):
+    """Provide the dataset of the current data version from shared memory."""
+
+    def __init__(self):
+        logger.debug("SharedDataset object is being created..")
+        self.version = None
+        self.df = None
+        self.lock = threading.Lock()
+
+    def get(self, version: str) -> pd.DataFrame:
+        """Return the dataset of a data version, publishing it first if no process has done so yet."""
+        if version != self.version:
+            with self.lock:
+                # Another thread may have attached it while this one waited
+                if version != self.version:
+                    path = dataset_path(version)
+                    if not path.is_file():
+                        publish(loader(), version)
+                    self.df = attach(path)
+                    self.version = version
+        return self.df
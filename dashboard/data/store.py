@@ -0,0 +1,208 @@
+"""Columnar dataset store.
+
+The CSV sources in `data/processed` and `data/epoch_benchmark_data` are compiled once into Arrow IPC (Feather v2)
+files under `cache/store`. A manifest keeps the content hash of every source so that only changed inputs are rebuilt,
+and datasets are read back memory-mapped, optionally restricted to the columns a caller needs.
+
+The sources are checked for changes at most once every `CHECK_INTERVAL` seconds, so that reading the data version on
+every request does not scan the source directories every time.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+from pyarrow import feather
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STORE_DIR = ROOT_DIR / "cache" / "store"
+MANIFEST_FILE = STORE_DIR / "manifest.json"
+
+SOURCE_DIRS = [
+    ROOT_DIR / "data" / "processed",
+    ROOT_DIR / "data" / "epoch_benchmark_data",
+]
+
+CHECK_INTERVAL = 2.0  # Seconds
+
+# Manifest of the last check of the sources, and when it happened
+checked_manifest = None
+checked_at = 0.0
+check_lock = threading.Lock()
+
+
+def source_files() -> dict[str, Path]:
+    """Return the CSV sources of the store, keyed by dataset name (the file stem)."""
+    return {path.stem: path for source_dir in SOURCE_DIRS for path in sorted(source_dir.glob("*.csv"))}
+
+
+def source_label(path: Path) -> str:
+    """Return the path of a source relative to the repository, or its absolute path if it is outside of it."""
+    path = path.resolve()
+    return str(path.relative_to(ROOT_DIR)) if path.is_relative_to(ROOT_DIR) else str(path)
+
+
+def file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest() -> dict:
+    """Return the store manifest, or an empty manifest if the store has not been built yet."""
+    if not MANIFEST_FILE.is_file():
+        return {"datasets": {}}
+    with open(MANIFEST_FILE, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: dict) -> None:
+    """Atomically replace the manifest on disk."""
+    # Every writer has its own temporary file, so that concurrent processes do not write into each other's
+    with tempfile.NamedTemporaryFile("w", dir=STORE_DIR, suffix=".tmp", delete=False) as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f.name, MANIFEST_FILE)
+
+
+def compile_dataset(name: str, source: Path) -> dict:
+    """Compile a single CSV source into an uncompressed Arrow IPC file.
+
+    The file is written uncompressed so that it can be memory-mapped without decoding.
+
+    Args:
+        name (str): name of the dataset
+        source (Path): path to the CSV source
+
+    Returns:
+        dict: manifest entry describing the compiled artifact
+    """
+    df = pd.read_csv(source, low_memory=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    artifact = STORE_DIR / f"{name}.arrow"
+    with tempfile.NamedTemporaryFile(dir=STORE_DIR, prefix=f"{name}.", suffix=".tmp", delete=False) as f:
+        tmp_artifact = f.name
+    feather.write_feather(table, tmp_artifact, compression="uncompressed")
+    os.replace(tmp_artifact, artifact)
+
+    return {"artifact": artifact.name, "rows": table.num_rows, "columns": table.column_names}
+
+
+def build_store(force: bool = False) -> dict:
+    """Bring the store up to date with its CSV sources.
+
+    Sources whose size and modification time did not change are skipped without being read. Otherwise the source is
+    hashed and only recompiled when its content differs from the manifest.
+
+    Args:
+        force (bool): if True, every source is recompiled
+
+    Returns:
+        dict: the updated manifest
+    """
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest()
+    entries = manifest["datasets"]
+    sources = source_files()
+    changed = False
+
+    for name, source in sources.items():
+        stat = source.stat()
+        entry = entries.get(name)
+        artifact_exists = entry is not None and (STORE_DIR / entry["artifact"]).is_file()
+
+        if not force and artifact_exists and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            continue
+
+        digest = file_hash(source)
+        if not force and artifact_exists and entry["sha256"] == digest:
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            changed = True
+            continue
+
+        logger.info(f"Compiling dataset '{name}' into the columnar store..")
+        entries[name] = {
+            **compile_dataset(name, source),
+            "source": source_label(source),
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        changed = True
+
+    # Drop datasets whose source has been removed
+    for name in set(entries) - set(sources):
+        logger.info(f"Removing dataset '{name}' from the columnar store..")
+        (STORE_DIR / entries.pop(name)["artifact"]).unlink(missing_ok=True)
+        changed = True
+
+    if changed:
+        manifest["version"] = compute_version(entries)
+        write_manifest(manifest)
+
+    return manifest
+
+
+def compute_version(entries: dict) -> str:
+    """Return a version string derived from the content hashes of all sources."""
+    digest = hashlib.sha256()
+    for name in sorted(entries):
+        digest.update(f"{name}:{entries[name]['sha256']}".encode())
+    return digest.hexdigest()[:16]
+
+
+def current_manifest() -> dict:
+    """Return the manifest of the store, bringing it up to date at most once every `CHECK_INTERVAL` seconds."""
+    global checked_manifest, checked_at
+    with check_lock:
+        if checked_manifest is None or time.monotonic() - checked_at >= CHECK_INTERVAL:
+            checked_manifest = build_store()
+            checked_at = time.monotonic()
+        return checked_manifest
+
+
+def invalidate() -> None:
+    """Check the sources again on the next read, e.g. after changing `SOURCE_DIRS`."""
+    global checked_manifest
+    with check_lock:
+        checked_manifest = None
+
+
+def data_version() -> str:
+    """Return the version of the data currently in the store."""
+    return current_manifest().get("version", "")
+
+
+def list_datasets() -> list[str]:
+    """Return the names of all datasets in the store."""
+    return sorted(current_manifest()["datasets"])
+
+
+def read_dataset(name: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a dataset from the store.
+
+    The Arrow file is memory-mapped, so only the requested columns are paged in.
+
+    Args:
+        name (str): name of the dataset, e.g. 'combined_benchmarks_cleaned' or 'mmlu_external'
+        columns (list[str] | None): columns to read, all columns if None
+
+    Returns:
+        pd.DataFrame: the dataset
+    """
+    entries = current_manifest()["datasets"]
+    if name not in entries:
+        raise KeyError(f"Unknown dataset '{name}'")
+
+    table = feather.read_table(STORE_DIR / entries[name]["artifact"], columns=columns, memory_map=True)
+    return table.to_pandas()
@@ -0,0 +1,79 @@
+"""Summary metadata of the dataset (number of records, benchmarks and capabilities).
+
+The summary is read from `data_summary.json` when that file matches the data version being served, and computed from
+the loaded dataset otherwise. The result is cached in memory until the data version or the file changes.
+
+Run `python -m dashboard.data.summary` to regenerate the file.
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from dashboard.data.store import data_version
+from dashboard.singleton import SingletonMeta
+
+SUMMARY_FILE = Path(__file__).resolve().parents[2] / "data" / "processed" / "data_summary.json"
+
+
+def compute_summary(df: pd.DataFrame, version: str) -> dict:
+    """Compute the summary from the dataset."""
+    return {
+        "data_version": version,
+        "total_records": len(df.index),
+        "benchmarks": sorted(df["benchmark"].dropna().unique().tolist()),
+        "capabilities": sorted(df["capability"].dropna().unique().tolist()),
+    }
+
+
+def write_summary(df: pd.DataFrame) -> dict:
+    """Write the summary of the dataset to `data_summary.json`."""
+    summary = compute_summary(df, data_version())
+    with open(SUMMARY_FILE, "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+class Summary(metaclass=SingletonMeta):
+    """Provide the summary of the dataset, cached per data version."""
+
+    def __init__(self):
+        logger.debug("Summary object is being created..")
+        self.key = None
+        self.summary = {}
+
+    def get(self, df: pd.DataFrame) -> dict:
+        """Return the summary of the dataset being served.
+
+        Args:
+            df (pd.DataFrame): the dataset, only used when the summary has to be computed
+
+        Returns:
+            dict: summary with keys 'total_records', 'benchmarks' and 'capabilities'
+        """
+        version = data_version()
+        mtime = SUMMARY_FILE.stat().st_mtime_ns if SUMMARY_FILE.is_file() else None
+
+        if (version, mtime) != self.key:
+            self.summary = self.load(df, version)
+            self.key = (version, mtime)
+        return self.summary
+
+    def load(self, df: pd.DataFrame, version: str) -> dict:
+        """Read the summary file, or compute the summary if the file is missing or stale."""
+        if SUMMARY_FILE.is_file():
+            with open(SUMMARY_FILE, "r") as f:
+                summary = json.load(f)
+            if summary.get("data_version") == version:
+                return summary
+
+        logger.info("Summary file is missing or stale, computing the summary from the dataset..")
+        return compute_summary(df, version)
+
+
+if __name__ == "__main__":
+    from dashboard.data.loader import loader
+
+    write_summary(loader(columns=["benchmark", "capability"]))
@@ -1,30 +1,23 @@
-import json
 import pandas as pd  # Included for completeness, though not used here
 
 
-def get_number_of_records(file_path: str) -> int:
+def get_number_of_records(summary: dict) -> int:
     """
-    Get the number of records in the dataset by loading the summary JSON file.
+    Get the number of records in the dataset from its summary.
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return data['total_records']
+    return summary['total_records']
 
-def total_benchmarks(file_path: str) -> int:
+def total_benchmarks(summary: dict) -> int:
     """
-    Get the total number of benchmarks in the dataset by loading the summary JSON file.
+    Get the total number of benchmarks in the dataset from its summary.
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return len(data['benchmarks'])
+    return len(summary['benchmarks'])
 
-def total_capabilities(file_path: str) -> int:
+def total_capabilities(summary: dict) -> int:
     """
-    Get the total number of capabilities in the dataset by loading the summary JSON file.
+    Get the total number of capabilities in the dataset from its summary.
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return len(data['capabilities'])
+    return len(summary['capabilities'])
 
 
 
@@ -1,17 +1,42 @@
+from functools import wraps
+
 import pandas as pd
 
 from dashboard.caching import cleaned_data
 
 
-def filter_by_country(func):
-    def wrapper(df, country, *args, **kwargs):
-        # Convert the dictionary to DataFrame and filter by country
-        filtered_df = df[df["Country"] == country]
+def filter_by(column: str):
+    """Filter the DataFrame passed to the decorated function on the value of a column.
 
-        # Call the original function with the filtered DataFrame
-        return func(filtered_df, *args, **kwargs)
+    The value is taken from the argument following the DataFrame, and can be a single value, a list of values, or
+    None to keep all rows. Decorators compose, the outermost one consumes the first value:
 
-    return wrapper
+        @filter_by("country")
+        @filter_by("year")
+        def callback(df, ...): ...
+
+        callback(df, country, year, ...)
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(df, value, *args, **kwargs):
+            if value is None:
+                filtered_df = df
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                filtered_df = df[df[column].isin(value)]
+            else:
+                filtered_df = df[df[column] == value]
+
+            # Call the original function with the filtered DataFrame
+            return func(filtered_df, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+filter_by_country = filter_by("country")
 
 
 def df_from_dict(func):
@@ -26,6 +51,7 @@ def df_from_dict(func):
 
 
 def load_df(func):
+    @wraps(func)
     def wrapper(*args, **kwargs):
         # Convert the dictionary to DataFrame
         df = cleaned_data()
@@ -0,0 +1,86 @@
+"""Shape-preserving downsampling of time series.
+
+Series longer than the pixel budget of a figure are reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps
+the points that contribute most to the visual shape of the line. The running-best frontier (every point that set a
+new best score at its date) and outliers are always kept, as they are what the reader looks for.
+"""
+
+import numpy as np
+import pandas as pd
+
+PIXEL_BUDGET = 800  # Points drawn per series, about the width of a figure in pixels
+OUTLIER_Z = 3.0  # Points further than this many standard deviations from the mean are kept
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Return the positions of the points selected by Largest-Triangle-Three-Buckets.
+
+    Args:
+        x (np.ndarray): sorted x values
+        y (np.ndarray): y values
+        n_out (int): number of points to select, including the first and the last point
+
+    Returns:
+        np.ndarray: sorted positions of the selected points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries of the points between the first and the last one
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket, or the last point for the last bucket
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        # Area of the triangles formed by the previous selected point, each candidate and the next average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def frontier(y: np.ndarray) -> np.ndarray:
+    """Return a mask of the points that set a new running best, for points sorted by x."""
+    return y >= np.fmax.accumulate(y)
+
+
+def outliers(y: np.ndarray, z: float = OUTLIER_Z) -> np.ndarray:
+    """Return a mask of the points further than `z` standard deviations from the mean."""
+    std = y.std()
+    if std == 0:
+        return np.zeros(len(y), dtype=bool)
+    return np.abs(y - y.mean()) > z * std
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, budget: int = PIXEL_BUDGET) -> pd.DataFrame:
+    """Reduce a series to about `budget` points, keeping its shape, its running-best frontier and its outliers.
+
+    Args:
+        df (pd.DataFrame): series sorted by `x`, without missing values in `x` and `y`
+        x (str): column of the x values (numeric or datetime)
+        y (str): column of the y values
+        budget (int): number of points selected by LTTB
+
+    Returns:
+        pd.DataFrame: the selected rows, in their original order
+    """
+    if len(df) <= budget:
+        return df
+
+    x_values = df[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+    x_values = x_values.astype(float)
+    y_values = df[y].to_numpy(dtype=float)
+
+    keep = frontier(y_values) | outliers(y_values)
+    keep[lttb(x_values, y_values, budget)] = True
+    return df[keep]
@@ -0,0 +1,54 @@
+"""Compact encoding of Plotly figures.
+
+- Scatter traces with many points are rendered with WebGL (`Scattergl`).
+- Styles shared by all traces of a type live once in the figure template instead of on every trace.
+
+Numeric arrays need no encoding here: Plotly 6 already serializes NumPy arrays as base64 typed arrays
+(`{"dtype": "f8", "bdata": ...}`), which Plotly.js decodes without parsing a JSON number per point.
+"""
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+WEBGL_THRESHOLD = 1000  # Points above which scatter traces are rendered with WebGL
+
+# Neon color palette (bright colors for contrast on the dark background)
+NEON_PALETTE = ["#FF00FF", "#00FFFF", "#FFFF00", "#FF0080", "#00FF80", "#8000FF", "#FF8000", "#00FF00"]
+
+TEMPLATE = "dashboard"
+
+
+def build_template() -> go.layout.Template:
+    """Dark theme of the dashboard."""
+    template = go.layout.Template(pio.templates["plotly_dark"])
+    template.layout.update(
+        paper_bgcolor="#0a0a15",
+        plot_bgcolor="#12121e",
+        font=dict(family="Arial", color="white"),
+        colorway=NEON_PALETTE,
+    )
+    return template
+
+
+pio.templates[TEMPLATE] = build_template()
+
+
+def template_with(*traces) -> go.layout.Template:
+    """Return the dashboard template with default styles for the given trace types.
+
+    Each trace is the style shared by all traces of its type in a figure, so it is sent once instead of per trace.
+    """
+    template = go.layout.Template(pio.templates[TEMPLATE])
+    for trace in traces:
+        template.data[trace.type] = [trace]
+    return template
+
+
+def scatter_class(n_points: int) -> type[go.Scatter] | type[go.Scattergl]:
+    """Return the scatter trace type to use for a number of points."""
+    return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
+
+
+def render_mode(n_points: int) -> str:
+    """Return the `render_mode` of a Plotly Express figure with a number of points."""
+    return "webgl" if n_points > WEBGL_THRESHOLD else "svg"
@@ -1,65 +1,85 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import os
-
-def load_benchmark_data(data_dir):
-    """Load all CSV files from the benchmark directory."""
-    dataframes = {}
-    for file in os.listdir(data_dir):
-        if file.endswith('.csv'):
-            path = os.path.join(data_dir, file)
-            df = pd.read_csv(path)
-            dataframes[file.replace('.csv', '')] = df
-    return dataframes
-
-def plot_training_time(df):
-    """Plot training time comparison."""
-    fig = px.bar(df, x='model', y='training_time',
-                 title='Training Time by Model',
-                 labels={'training_time': 'Training Time (seconds)',
-                        'model': 'Model'})
-    fig.update_traces(textposition='outside')
-    return fig
+from pathlib import Path
 
-def plot_memory_usage(df):
-    """Plot memory usage comparison."""
-    fig = px.bar(df, x='model', y='memory_usage',
-                 title='Memory Usage by Model',
-                 labels={'memory_usage': 'Memory Usage (MB)',
-                        'model': 'Model'})
-    fig.update_traces(textposition='outside')
-    return fig
+from dashboard.data.normalize import EPOCH_DIR, load_long_table
+from dashboard.graphs.downsample import downsample
+from dashboard.graphs.encoding import NEON_PALETTE, TEMPLATE, render_mode
+
+
+def load_benchmark_data(data_dir, max_workers=None):
+    """Load all CSV files from the benchmark directory into one long table, see `load_long_table`."""
+    return load_long_table(Path(data_dir), max_workers=max_workers)
 
-def plot_accuracy_comparison(df):
-    """Plot accuracy metrics comparison."""
-    fig = px.scatter(df, x='model', y=['accuracy', 'precision', 'recall', 'f1_score'],
-                    title='Model Performance Metrics',
-                    labels={'value': 'Score', 'model': 'Model',
-                           'variable': 'Metric'})
+
+def dark_layout(fig, title):
+    """Apply the dark theme used by the benchmark pages."""
+    fig.update_layout(title=title, template=TEMPLATE)
     return fig
 
+
+def graph_score_over_time(df, date_range=None):
+    """Line plot of the scores by release date, colored by organization.
+
+    Long series are downsampled to the pixel budget of the figure (see `downsample`). If a date range is given (e.g.
+    when the user zoomed in), only that range is drawn, with up to the same number of points.
+    """
+    df_plot = df.dropna(subset=['date', 'score']).sort_values('date')
+    if date_range is not None:
+        start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
+        df_plot = df_plot[(df_plot['date'] >= start) & (df_plot['date'] <= end)]
+    df_plot = downsample(df_plot, 'date', 'score')
+    fig = px.line(df_plot, x='date', y='score', color='org', markers=True, hover_name='model',
+                  labels={'date': 'Release date', 'score': 'Score', 'org': 'Organization'},
+                  color_discrete_sequence=NEON_PALETTE, render_mode=render_mode(len(df_plot)))
+    fig.update_xaxes(type='date', range=date_range)
+    return dark_layout(fig, 'Score Trends Over Time')
+
+
+def graph_score_by_org(df):
+    """Bar plot of the average score by organization."""
+    df_grouped = (
+        df.dropna(subset=['score'])
+        .groupby('org', observed=True)['score']
+        .mean()
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+    fig = px.bar(df_grouped, x='org', y='score',
+                 labels={'org': 'Organization', 'score': 'Average score'},
+                 color_discrete_sequence=NEON_PALETTE)
+    return dark_layout(fig, 'Average Score by Organization')
+
+
+def graph_compute_vs_score(df):
+    """Scatter plot of the score against training compute (log scale)."""
+    df_plot = df.dropna(subset=['training_compute_flops', 'score'])
+    fig = px.scatter(df_plot, x='training_compute_flops', y='score', color='org', hover_name='model', log_x=True,
+                     labels={'training_compute_flops': 'Training compute (FLOP)', 'score': 'Score',
+                             'org': 'Organization'},
+                     color_discrete_sequence=NEON_PALETTE, render_mode=render_mode(len(df_plot)))
+    return dark_layout(fig, 'Score vs. Training Compute')
+
+
 def create_benchmark_visualizations(data_dir):
-    """Create all benchmark visualizations."""
-    # Load data
+    """Create the figures of the benchmark pages for every benchmark of a directory of Epoch benchmark files."""
     data = load_benchmark_data(data_dir)
-    
-    # Create plots for each dataset
+
     plots = {}
-    for dataset_name, df in data.items():
+    for dataset_name, df in data.groupby("benchmark", observed=True):
         plots[dataset_name] = {
-            'training_time': plot_training_time(df),
-            'memory_usage': plot_memory_usage(df),
-            'performance_metrics': plot_accuracy_comparison(df)
+            'score_over_time': graph_score_over_time(df),
+            'score_by_org': graph_score_by_org(df),
+            'compute_vs_score': graph_compute_vs_score(df),
         }
-    
+
     return plots
 
 # Usage
 if __name__ == "__main__":
-    data_dir = "/home/mukullight/Music/hackealt/data/epoch_benchmark_data"
-    plots = create_benchmark_visualizations(data_dir)
-    
+    plots = create_benchmark_visualizations(EPOCH_DIR)
+
     # Save or display plots as needed
     for dataset, dataset_plots in plots.items():
         for plot_name, fig in dataset_plots.items():
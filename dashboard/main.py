@@ -1,24 +1,72 @@
-import os
+import sys
 
 import dash
 import dash_bootstrap_components as dbc
 from dash import Dash, Input, Output, State, dcc, html
 from dotenv import load_dotenv
-from flask import send_from_directory
+from flask import Flask
 from loguru import logger
 from pathlib import Path
+from dashboard.api import api
 from dashboard.caching import cache, cleaned_data
+from dashboard.compression import register_compression
 from dashboard.data.database import Database
+from dashboard.data.summary import Summary
+from dashboard.metrics import instrument_cache, register_metrics
+from dashboard.profiling import register_profiling
+from dashboard.startup import is_eager, timed
+from dashboard.static import register_static_route, static_url
 from dashboard.utils import TITLE
 
 load_dotenv()
 
-app = Dash(title=TITLE, external_stylesheets=[dbc.icons.BOOTSTRAP], use_pages=True, suppress_callback_exceptions=True)
+# Self-hosted stylesheets, see dashboard/static.py
+STYLESHEETS = [static_url("vendor/bootstrap-icons/bootstrap-icons.min.css"), static_url("css/fonts.css")]
+
+app = Dash(
+    # Without the static route of Flask, which would shadow the one serving `static` (see `register_static_route`)
+    server=Flask(__name__, static_folder=None),
+    title=TITLE,
+    external_stylesheets=STYLESHEETS,
+    use_pages=True,
+    suppress_callback_exceptions=True,
+)
 server = app.server
+register_static_route(server)
+server.register_blueprint(api)
+# Before the compression, so that the metrics see the responses as sent
+register_metrics(app)
+register_profiling(app)
+register_compression(server)
 cache.init_app(app.server)
+instrument_cache(cache)
+
+
+
+def warm_up() -> None:
+    """Load the data, sync the database and prepare the page assets ahead of the first request.
+
+    Pages can define a `warm_up()` function, which is called here. When the app is preloaded by the server (see
+    `gunicorn.conf.py`), this runs once in the master process and the workers inherit the result.
+    """
+    with timed("cleaned_data"):
+        df = cleaned_data()
+    with timed("Summary"):
+        Summary().get(df)
+    with timed("Database.load"):
+        Database().load()
 
-df = cleaned_data()
-Database().load(df)
+    with server.app_context():
+        for page in dash.page_registry.values():
+            module = sys.modules.get(page["module"])
+            if hasattr(module, "warm_up"):
+                with timed(f"{page['module']}.warm_up"):
+                    module.warm_up()
+
+
+# In lazy mode (the default) the data is loaded by the first callback that needs it
+if is_eager():
+    warm_up()
 
 MICHELIN_LOGO = "assets/img/logos/logo.svg"
 
@@ -27,16 +75,17 @@ NAVBAR = {
     "Analysis": {
 
         "Home": {"icon": "bi bi-house", "relative_path": "/"},
-        "Aider Polyglot": {"icon": "bi bi-currency-dollar", "relative_path": "aider_polyglot_dashboard"},
-        "Balrog": {"icon": "bi bi-bar-chart", "relative_path": "/balrog_dashboard"},
-        "CommonsenseQA2": {"icon": "bi bi-question-circle", "relative_path": "/commonsenseqa2_dashboard"},
-        "ANLI": {"icon": "bi bi-lightning", "relative_path": "/anli_dashboard"},
-        "BBH": {"icon": "bi bi-graph-up", "relative_path": "/bbh_dashboard"},
-        "CYBench External": {"icon": "bi bi-pie-chart", "relative_path": "/cybench_external_dashboard"},
-        "ARC AGI": {"icon": "bi bi-robot", "relative_path": "/arc_agi_dashboard"},
-        "BoolQ": {"icon": "bi bi-check2-circle", "relative_path": "/boolq_dashboard"},
-        "CAD Eval External": {"icon": "bi bi-bar-chart-line", "relative_path": "/cad_eval_external_dashboard"},
-        "ARC AI2": {"icon": "bi bi-lightbulb", "relative_path": "/arc_ai2_dashboard"},
+        "Leaderboard": {"icon": "bi bi-trophy", "relative_path": "/leaderboard"},
+        "Aider Polyglot": {"icon": "bi bi-currency-dollar", "relative_path": "/benchmark/aider_polyglot"},
+        "Balrog": {"icon": "bi bi-bar-chart", "relative_path": "/benchmark/balrog"},
+        "CommonsenseQA2": {"icon": "bi bi-question-circle", "relative_path": "/benchmark/common_sense_qa_2"},
+        "ANLI": {"icon": "bi bi-lightning", "relative_path": "/benchmark/adversarial_nli"},
+        "BBH": {"icon": "bi bi-graph-up", "relative_path": "/benchmark/bbh"},
+        "CYBench External": {"icon": "bi bi-pie-chart", "relative_path": "/benchmark/cybench"},
+        "ARC AGI": {"icon": "bi bi-robot", "relative_path": "/benchmark/arc_agi"},
+        "BoolQ": {"icon": "bi bi-check2-circle", "relative_path": "/benchmark/bool_q"},
+        "CAD Eval External": {"icon": "bi bi-bar-chart-line", "relative_path": "/benchmark/cad_eval"},
+        "ARC AI2": {"icon": "bi bi-lightbulb", "relative_path": "/benchmark/arc_ai2"},
     },
     "Other": {
         "Home": {"icon": "bi bi-house", "relative_path": "/"},
@@ -127,7 +176,8 @@ content = html.Div(
 
 app.layout = html.Div(
     [
-        dcc.Location(id="url"),
+        # Callbacks writing the pathname (e.g. the benchmark dropdown) navigate without reloading the page
+        dcc.Location(id="url", refresh="callback-nav"),
         sidebar,
         navbar,
         content,
@@ -179,13 +229,6 @@ def toggle_navbar_collapse(n, _, is_open):
     return is_open
 
 
-# Serve static files
-@app.server.route("/static/<path:path>")
-def static_file(path):
-    static_folder = os.path.join(os.getcwd(), "static")
-    return send_from_directory(static_folder, path)
-
-
 app.index_string = """
 <!DOCTYPE html>
 <html>
@@ -201,10 +244,6 @@ app.index_string = """
         {%renderer%}
     </body>
 </html>
-
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Figtree:ital,wght@0,300..900;1,300..900&display=swap');
-</style>
 """
 
 if __name__ == "__main__":
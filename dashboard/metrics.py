@@ -0,0 +1,413 @@
+"""Prometheus metrics of the app, exposed at `/metrics` in the Prometheus text format.
+
+- latency of every route and of every Dash callback, labelled with the name of the callback function
+- size of the response bodies as sent (after compression), per route and per callback
+- hits, misses and evictions of the `flask_caching` cache
+- time spent in `cleaned_data()`
+- version and age of the data
+
+Clientside callbacks (e.g. `update_dashboard` of the overview) run in the browser and are not measured here.
+
+Every process keeps its metrics in memory. When `DASHBOARD_METRICS_DIR` is set (`gunicorn.conf.py` sets it), every
+process also writes them to its own file in that directory every `FLUSH_INTERVAL` seconds, and a scrape sums the
+files of all processes, so that it sees the same counters whichever worker answers it. When a worker exits, its file is
+merged into an archive file by the master (see `mark_process_dead`), so that counters never go down.
+"""
+
+import abc
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from dash import Dash
+from flask import Response, g, request
+from flask_caching import Cache
+
+from dashboard.data.store import read_manifest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+SIZE_BUCKETS = tuple(4**i * 1024 for i in range(8))  # 1 KiB to 16 MiB
+CALLBACK_PATH = "/_dash-update-component"
+VERSION_KEY_SUFFIX = "_memver"  # Keys of the versions `Cache.memoize` keeps per function, see `instrument_cache`
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS_DIR = Path(os.environ["DASHBOARD_METRICS_DIR"]) if os.getenv("DASHBOARD_METRICS_DIR") else None
+FLUSH_INTERVAL = 1.0  # Seconds
+ARCHIVE_FILE = "archive.json"  # Metrics of the processes that exited
+LOCK_FILE = "metrics.lock"
+
+REGISTRY = []
+
+
+def escape(value: str) -> str:
+    """Escape a label value of the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metric(abc.ABC):
+    """Base class of a metric family, whose samples are keyed by their label values."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> dict:
+        """Return a copy of the values of this process."""
+        with self.lock:
+            return dict(self.values)
+
+    @staticmethod
+    def combine(value, other):
+        """Return the sum of the values of a sample in two processes."""
+        return value + other
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values.clear()
+
+    @abc.abstractmethod
+    def samples(self, values: dict):
+        """Yield the (suffix, labels, value) samples of the family, from its values keyed by label values."""
+
+    def render(self, values: dict) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples(values):
+            lines.append(f"{self.name}{suffix}{format_labels(labels)} {value:g}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self, values: dict):
+        for key, value in values.items():
+            yield "_total", dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Metric):
+    """Gauge whose value is computed by a function when the metrics are collected, the same in every process."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, collect, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def snapshot(self) -> dict:
+        return {}
+
+    def samples(self, values: dict):
+        # The function returns {label values: value}
+        for key, value in self.collect().items():
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels) -> None:
+        key = self.key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+
+    def time(self):
+        """Decorator observing the duration of every call of a function."""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {key: (list(counts), total) for key, (counts, total) in self.values.items()}
+
+    @staticmethod
+    def combine(value, other):
+        (counts, total), (other_counts, other_total) = value, other
+        return [a + b for a, b in zip(counts, other_counts)], total + other_total
+
+    def samples(self, values: dict):
+        for key, (counts, total) in values.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield "_bucket", {**labels, "le": "+Inf" if bound == float("inf") else f"{bound:g}"}, cumulative
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+def data_version_info() -> dict:
+    return {(read_manifest().get("version", ""),): 1}
+
+
+def data_version_age() -> dict:
+    """Seconds since the newest source of the store was modified."""
+    mtimes = [entry["mtime_ns"] for entry in read_manifest()["datasets"].values()]
+    return {(): time.time() - max(mtimes) / 1e9} if mtimes else {}
+
+
+REQUEST_SECONDS = Histogram(
+    "dashboard_request_duration_seconds", "Latency of the requests per route.", ("route", "method", "status")
+)
+CALLBACK_SECONDS = Histogram("dashboard_callback_duration_seconds", "Latency of the Dash callbacks.", ("callback",))
+RESPONSE_BYTES = Histogram(
+    "dashboard_response_size_bytes", "Size of the response bodies as sent.", ("route",), buckets=SIZE_BUCKETS
+)
+CALLBACK_BYTES = Histogram(
+    "dashboard_callback_response_size_bytes", "Size of the Dash callback responses as sent.", ("callback",),
+    buckets=SIZE_BUCKETS,
+)
+CACHE_REQUESTS = Counter("dashboard_cache_requests", "Lookups of the flask_caching cache.", ("result",))
+CACHE_SETS = Counter("dashboard_cache_sets", "Values stored in the flask_caching cache.")
+CACHE_EVICTIONS = Counter("dashboard_cache_evictions", "Entries pruned from the flask_caching cache.")
+CLEANED_DATA_SECONDS = Histogram("dashboard_cleaned_data_duration_seconds", "Time spent in cleaned_data().")
+DATA_VERSION = Gauge("dashboard_data_version_info", "Version of the data in the store.", data_version_info, ("version",))
+DATA_VERSION_AGE = Gauge("dashboard_data_version_age_seconds", "Age of the newest data source.", data_version_age)
+
+
+def process_values() -> dict:
+    """Return the values of all metrics of this process, in a form that can be written as JSON."""
+    return {metric.name: [[list(key), value] for key, value in metric.snapshot().items()] for metric in REGISTRY}
+
+
+def merge(dumps: list[dict]) -> dict[str, dict]:
+    """Sum the values of the metrics of several processes, see `process_values`."""
+    metrics = {metric.name: metric for metric in REGISTRY}
+    merged = {name: {} for name in metrics}
+    for dump in dumps:
+        for name, items in dump.items():
+            metric = metrics.get(name)
+            if metric is None:
+                continue
+            values = merged[name]
+            for key, value in items:
+                key = tuple(key)
+                values[key] = metric.combine(values[key], value) if key in values else value
+    return merged
+
+
+def process_file(pid: int) -> Path:
+    return METRICS_DIR / f"{pid}.json"
+
+
+@contextmanager
+def locked(shared: bool):
+    """Hold the lock of the metrics directory, so that a scrape never sees a worker both in its file and archived."""
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(METRICS_DIR / LOCK_FILE, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_json(path: Path, values: dict) -> None:
+    """Atomically replace a file of the metrics directory."""
+    # Every writer has its own temporary file, so that concurrent processes do not write into each other's
+    with tempfile.NamedTemporaryFile("w", dir=METRICS_DIR, suffix=".tmp", delete=False) as f:
+        json.dump(values, f)
+    os.replace(f.name, path)
+
+
+def read_json(path: Path) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def flush() -> None:
+    """Write the metrics of this process to its file, if the metrics are aggregated across processes."""
+    if METRICS_DIR is None:
+        return
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    write_json(process_file(os.getpid()), process_values())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Merge the file of a process that exited into the archive, called by the master (see `gunicorn.conf.py`)."""
+    if METRICS_DIR is None:
+        return
+    with locked(shared=False):
+        path = process_file(pid)
+        dump = read_json(path)
+        if not dump:
+            return
+        archive = merge([read_json(METRICS_DIR / ARCHIVE_FILE), dump])
+        write_json(
+            METRICS_DIR / ARCHIVE_FILE,
+            {name: [[list(key), value] for key, value in values.items()] for name, values in archive.items()},
+        )
+        path.unlink(missing_ok=True)
+
+
+def collect() -> dict[str, dict]:
+    """Return the values of all metrics, summed over all processes if the metrics are aggregated."""
+    if METRICS_DIR is None:
+        return {metric.name: metric.snapshot() for metric in REGISTRY}
+    flush()
+    with locked(shared=True):
+        return merge([read_json(path) for path in sorted(METRICS_DIR.glob("*.json"))])
+
+
+def reset() -> None:
+    """Forget the metrics of this process, e.g. those a worker inherited from the master when it was forked."""
+    for metric in REGISTRY:
+        metric.reset()
+
+
+class Flusher:
+    """Background thread writing the metrics of the process to its file every `FLUSH_INTERVAL` seconds."""
+
+    def __init__(self, interval: float = FLUSH_INTERVAL):
+        self.interval = interval
+        self.pid = None
+
+    def ensure_running(self) -> None:
+        # Threads do not survive a fork, so every worker process starts its own
+        if METRICS_DIR is None or self.pid == os.getpid():
+            return
+        self.pid = os.getpid()
+        threading.Thread(target=self.run, name="metrics", daemon=True).start()
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            flush()
+
+
+flusher = Flusher()
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text format."""
+    values = collect()
+    return "\n".join(metric.render(values[metric.name]) for metric in REGISTRY) + "\n"
+
+
+def callback_name(app: Dash) -> str:
+    """Return the name of the function of the callback being requested, or its output ID if it is unknown."""
+    body = request.get_json(silent=True) or {}
+    output = body.get("output", "unknown")
+    func = app.callback_map.get(output, {}).get("callback")
+    return getattr(func, "__name__", output)
+
+
+def instrument_cache(cache: Cache) -> None:
+    """Count the hits, misses, sets and evictions of a `flask_caching` cache, once it is initialized.
+
+    Internal keys are not counted, so that a hit or a miss is one memoized call: `Cache.memoize` looks up (and on a
+    miss, stores) a version key of the function before every value, and the filesystem backend keeps its file count
+    under a key of its own.
+    """
+    backend = cache.cache
+    get, set_ = backend.get, backend.set
+    count_key = getattr(backend, "_fs_count_file", None)
+
+    def internal(key: str) -> bool:
+        return key.endswith(VERSION_KEY_SUFFIX) or key == count_key
+
+    def counted_get(key, *args, **kwargs):
+        value = get(key, *args, **kwargs)
+        if not internal(key):
+            CACHE_REQUESTS.inc(result="miss" if value is None else "hit")
+        return value
+
+    def counted_set(key, *args, **kwargs):
+        if not internal(key):
+            CACHE_SETS.inc()
+        return set_(key, *args, **kwargs)
+
+    backend.get, backend.set = counted_get, counted_set
+
+    # The filesystem backend prunes expired and old entries when it holds more than its threshold
+    prune = getattr(backend, "_prune", None)
+    if prune is not None and hasattr(backend, "_file_count"):
+
+        def counted_prune():
+            before = backend._file_count
+            prune()
+            CACHE_EVICTIONS.inc(max(before - backend._file_count, 0))
+
+        backend._prune = counted_prune
+
+
+def register_metrics(app: Dash) -> None:
+    """Measure every request of the Flask server of the app and serve the metrics at `/metrics`.
+
+    Register before the compression (see `dashboard.compression`), so that the measured sizes are those sent.
+    """
+    server = app.server
+
+    @server.before_request
+    def start_timer() -> None:
+        flusher.ensure_running()
+        g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def record(response: Response) -> Response:
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        REQUEST_SECONDS.observe(elapsed, route=route, method=request.method, status=response.status_code)
+
+        size = None if response.is_streamed else response.content_length
+        if size is not None:
+            RESPONSE_BYTES.observe(size, route=route)
+        if request.path == CALLBACK_PATH:
+            name = callback_name(app)
+            CALLBACK_SECONDS.observe(elapsed, callback=name)
+            if size is not None:
+                CALLBACK_BYTES.observe(size, callback=name)
+        return response
+
+    @server.route("/metrics")
+    def metrics() -> Response:
+        return Response(render(), content_type=CONTENT_TYPE, headers={"Cache-Control": "no-store"})
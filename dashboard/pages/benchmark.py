@@ -0,0 +1,102 @@
+import dash
+import dash_bootstrap_components as dbc
+from dash import Input, Output, State, callback, dcc, html, no_update
+
+from dashboard.caching import benchmark_figures, score_over_time_figure
+from dashboard.data.schema import SCHEMAS
+from dashboard.data.store import data_version
+from dashboard.utils import TITLE
+
+PAGE_TITLE = "Benchmark"
+
+dash.register_page(
+    __name__,
+    name=PAGE_TITLE,
+    title=f"{PAGE_TITLE} | {TITLE}",
+    path_template="/benchmark/<name>",
+    order=2,
+)
+
+
+def graph_card(title: str, figure, graph_id: str | None = None) -> dbc.Col:
+    """Wrap a figure in a card."""
+    graph = dcc.Graph(figure=figure) if graph_id is None else dcc.Graph(figure=figure, id=graph_id)
+    return dbc.Col(
+        dbc.Card(dbc.CardBody([html.H4(title), graph])),
+        class_name="mb-3",
+        width=12,
+    )
+
+
+def warm_up() -> None:
+    """Build the figures of every benchmark, see `dashboard.main.warm_up`."""
+    version = data_version()
+    for name in SCHEMAS:
+        benchmark_figures(name, version)
+
+
+def layout(name: str | None = None, **kwargs):
+    dropdown = dbc.Row(
+        dbc.Col(
+            dcc.Dropdown(
+                [{"label": schema.title, "value": schema.name} for schema in SCHEMAS.values()],
+                value=name,
+                clearable=False,
+                id="benchmark-dropdown-selection",
+            ),
+            md=3,
+            sm=12,
+        ),
+        class_name="mt-1 mb-3",
+    )
+
+    schema = SCHEMAS.get(name)
+    if schema is None:
+        return [html.H3("Benchmark not found", className="mb-3"), dropdown]
+
+    figures = benchmark_figures(schema.name, data_version())
+    return [
+        html.H3(schema.title, className="mb-3"),
+        html.P(schema.description) if schema.description else None,
+        dropdown,
+        dbc.Row(
+            [
+                graph_card("Score over time", figures["score_over_time"], graph_id="score-over-time-graph"),
+                graph_card("Average score by organization", figures["score_by_org"]),
+                graph_card("Score vs. training compute", figures["compute_vs_score"]),
+            ],
+            class_name="g-3",
+        ),
+    ]
+
+
+@callback(
+    Output("url", "pathname"),
+    Input("benchmark-dropdown-selection", "value"),
+    prevent_initial_call=True,
+)
+def select_benchmark(name: str) -> str:
+    """Navigate to the page of the selected benchmark."""
+    return f"/benchmark/{name}"
+
+
+@callback(
+    Output("score-over-time-graph", "figure"),
+    Input("score-over-time-graph", "relayoutData"),
+    State("benchmark-dropdown-selection", "value"),
+    prevent_initial_call=True,
+)
+def zoom_score_over_time(relayout_data: dict | None, name: str):
+    """Redraw the score over time at full resolution for the zoomed date range, the initial figure is downsampled."""
+    relayout_data = relayout_data or {}
+    if "xaxis.range[0]" in relayout_data:
+        date_range = [relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]]
+    elif "xaxis.range" in relayout_data:
+        date_range = relayout_data["xaxis.range"]
+    elif relayout_data.get("xaxis.autorange"):
+        date_range = None
+    else:
+        return no_update
+
+    figure = score_over_time_figure(name, data_version(), date_range)
+    return no_update if figure is None else figure
@@ -0,0 +1,92 @@
+import dash
+import dash_bootstrap_components as dbc
+from dash import Input, Output, callback, dcc, html
+
+from dashboard.caching import versioned_data
+from dashboard.data.leaderboard import MIN_BENCHMARKS, Leaderboard
+from dashboard.data.schema import SCHEMAS
+from dashboard.data.store import data_version
+from dashboard.utils import TITLE
+
+PAGE_TITLE = "Leaderboard"
+TOP_MODELS = 100  # Rows of the table
+DEFAULT_COLUMNS = 6  # Benchmarks shown when none is selected, the ones with the most models
+
+dash.register_page(__name__, name=PAGE_TITLE, title=f"{PAGE_TITLE} | {TITLE}", path="/leaderboard", order=1)
+
+
+def benchmark_title(name: str) -> str:
+    return SCHEMAS[name].title if name in SCHEMAS else name.replace("_", " ").title()
+
+
+def current_leaderboard() -> Leaderboard:
+    """Return the leaderboard of the current data version, built from the dataset of that same version."""
+    version = data_version()
+    return Leaderboard().get(versioned_data(version), version)
+
+
+def leaderboard_table(leaderboard: Leaderboard, selected: list[str] | None) -> dbc.Table:
+    """Build the table of the best models over the selected benchmarks, or over all benchmarks if none is selected."""
+    ranking = leaderboard.ranking(selected or None)
+    columns = selected or leaderboard.coverage().index[:DEFAULT_COLUMNS].tolist()
+
+    table = ranking.head(TOP_MODELS)[["rank", "model", "org", "percentile", "benchmarks", *columns]]
+    table = table.round(1).rename(
+        columns={
+            "rank": "#",
+            "model": "Model",
+            "org": "Organization",
+            "percentile": "Mean percentile",
+            "benchmarks": "Benchmarks",
+            **{name: benchmark_title(name) for name in columns},
+        }
+    )
+    # Categorical columns do not accept the placeholder as a value
+    table = table.astype(object).where(table.notna(), "-")
+    return dbc.Table.from_dataframe(table, striped=True, hover=True, size="sm", responsive=True)
+
+
+def warm_up() -> None:
+    """Build the leaderboard, see `dashboard.main.warm_up`."""
+    current_leaderboard()
+
+
+def layout():
+    leaderboard = current_leaderboard()
+    benchmarks = leaderboard.coverage()
+    return [
+        html.H3(PAGE_TITLE, className="mb-3"),
+        html.P(
+            f"""Models ranked by their mean percentile over the benchmarks they were evaluated on (100 is the best
+            score of a benchmark, 0 the worst). Models evaluated on fewer than {MIN_BENCHMARKS} of the selected
+            benchmarks (or on none of them, when fewer are selected) are not ranked."""
+        ),
+        dbc.Row(
+            dbc.Col(
+                dcc.Dropdown(
+                    [
+                        {"label": f"{benchmark_title(name)} ({count})", "value": name}
+                        for name, count in benchmarks.items()
+                    ],
+                    value=[],
+                    multi=True,
+                    placeholder="All benchmarks",
+                    id="leaderboard-benchmarks",
+                ),
+                md=6,
+                sm=12,
+            ),
+            class_name="mt-1 mb-3",
+        ),
+        html.Div(leaderboard_table(leaderboard, None), id="leaderboard-table"),
+    ]
+
+
+@callback(
+    Output("leaderboard-table", "children"),
+    Input("leaderboard-benchmarks", "value"),
+    prevent_initial_call=True,
+)
+def update_leaderboard(selected: list[str] | None) -> dbc.Table:
+    """Rank the models over the selected benchmarks."""
+    return leaderboard_table(current_leaderboard(), selected)
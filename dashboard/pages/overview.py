@@ -1,20 +1,19 @@
 import dash
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
-from dash import Input, Output, callback, dcc, html
-from pathlib import Path
+import plotly.graph_objects as go
+from dash import ClientsideFunction, Input, Output, State, callback, clientside_callback, dcc, html
+from functools import cache
+from plotly.subplots import make_subplots
 
+from dashboard.data.capabilities import load_capability_series
+from dashboard.data.summary import Summary
 from dashboard.data.utils import get_number_of_records, total_benchmarks, total_capabilities
 from dashboard.decorators import load_df
-
+from dashboard.graphs.encoding import scatter_class, template_with
 from dashboard.utils import TITLE
 
-import dash
-from dash import dcc, html, Input, Output
-import dash_bootstrap_components as dbc
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-
 category_colors = {
     "coding": "#636EFA",
     "reasoning": "#EF553B",
@@ -24,49 +23,44 @@ category_colors = {
     "agents": "#19D3F3"
 }
 
-import json
-
-pth = str(Path(__file__).resolve().parents[2] / "data" / "processed" / "capability_heights.json")
-with open(pth) as f:
-    data = json.load(f)
+# === Capability series, loaded on first use and precomputed once ===
+@cache
+def capability_series():
+    return load_capability_series()
 
-capabilities_data = data['all']  # if your JSON has the 'all' key
-
-# === Flattened capabilities data ===
-capabilities_data = {k: v for k, v in data['all'].items()}
 
+@cache
+def capability_colors() -> list[str]:
+    return [category_colors.get(category, "#ffffff") for category in capability_series().categories]
 
 
 PAGE_TITLE = "Overview"
 dash.register_page(__name__, name=PAGE_TITLE, title=f"{PAGE_TITLE} | {TITLE}", path="/", order=0)
-file_path = str(Path(__file__).resolve().parents[2] / "data" / "processed" / "data_summary.json")
-
 
 
+DEFAULT_SELECTION = ["code_generation", "physical_intuition", "scientific_reasoning"]
 
+# Styles shared by all timelines and bars, sent once with the template instead of with every trace
+TIMELINE_STYLE = dict(
+    mode="lines+markers",
+    line=dict(width=3),
+    marker=dict(size=10, line=dict(width=2, color='white')),
+    hovertemplate="<b>%{fullData.name}</b><br>Year: %{x}<br>Score: %{y:.1f}%<extra></extra>",
+)
+OVERVIEW_TEMPLATE = template_with(
+    go.Scatter(**TIMELINE_STYLE),
+    go.Scattergl(**TIMELINE_STYLE),
+    go.Bar(marker=dict(line=dict(color='white', width=1.5)), textposition='outside', showlegend=False),
+)
 
-# === Statistics ===
-def calculate_stats(selected_caps):
-    if not selected_caps:
-        return 0, 0, 0, 0
-    improvements, growth_rates, current_scores = [], [], []
-    for cap in selected_caps:
-        cap_data = capabilities_data[cap]
-        scores = list(cap_data['heights'].values())
-        years = sorted(cap_data['heights'].keys())
-        improvement = scores[-1] - scores[0]
-        improvements.append(improvement)
-        current_scores.append(scores[-1])
-        if len(years) > 1 and scores[0] != 0:
-            total_growth = (scores[-1] - scores[0]) / scores[0]
-            avg_annual = (total_growth / (len(years) - 1)) * 100
-            growth_rates.append(avg_annual)
-    avg_improvement = sum(improvements) / len(improvements)
-    avg_growth = sum(growth_rates) / len(growth_rates) if growth_rates else 0
-    return avg_improvement, avg_growth, max(current_scores), min(current_scores)
 
 # === Figure builder ===
 def build_figure(selected_caps):
+    """Build the figure with a trace for every capability, of which only the selected ones are visible.
+
+    The first `len(capabilities)` traces are the timelines, followed by the improvement and annual growth bars. The
+    clientside callback in `assets/js/overview.js` relies on this order.
+    """
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=("📈 Timeline Evolution", "📊 Improvement 2019-2025", "⚡ Annual Growth", ""),
@@ -74,64 +68,42 @@ def build_figure(selected_caps):
         row_heights=[0.6, 0.4],
         vertical_spacing=0.12
     )
-    
-    for name in selected_caps:
-        data_cap = capabilities_data[name]
-        years = sorted(data_cap["heights"].keys())
-        scores = [data_cap["heights"][y] * 100 for y in years]
-        color = category_colors.get(data_cap["category"], "#ffffff")
-        fig.add_trace(go.Scatter(
-            x=years, y=scores, mode="lines+markers", name=name,
-            line=dict(color=color, width=3),
-            marker=dict(size=10, line=dict(width=2, color='white')),
-            hovertemplate="<b>%{fullData.name}</b><br>Year: %{x}<br>Score: %{y:.1f}%<extra></extra>"
+    capabilities = capability_series()
+    idx = capabilities.indices(selected_caps)
+    names = [name[:20] for name in selected_caps]
+    colors = [capability_colors()[i] for i in idx]
+
+    selected = set(selected_caps)
+    for i, name in enumerate(capabilities.names):
+        scatter = scatter_class(len(capabilities.years[i]))
+        fig.add_trace(scatter(
+            x=capabilities.years[i], y=capabilities.scores[i], name=name,
+            visible=name in selected,
+            line=dict(color=capability_colors()[i]),
         ), row=1, col=1)
     
     # Bar 1: improvement
-    improvements, names_bar, colors_bar = [], [], []
-    for name in selected_caps:
-        data_cap = capabilities_data[name]
-        years = sorted(data_cap["heights"].keys())
-        scores = [data_cap["heights"][y] * 100 for y in years]
-        improvements.append(scores[-1] - scores[0])
-        names_bar.append(name[:20])
-        colors_bar.append(category_colors.get(data_cap["category"], "#ffffff"))
-    
+    improvements = capabilities.improvement[idx]
     fig.add_trace(go.Bar(
-        y=names_bar, x=improvements, orientation='h',
-        marker=dict(color=colors_bar, line=dict(color='white', width=1.5)),
+        y=names, x=improvements, orientation='h',
+        marker=dict(color=colors),
         text=[f"+{imp:.1f}%" for imp in improvements],
-        textposition='outside',
-        showlegend=False
     ), row=2, col=1)
     
-    # Bar 2: annual growth
-    growths, names_growth, colors_growth = [], [], []
-    for name in selected_caps:
-        data_cap = capabilities_data[name]
-        years = sorted(data_cap["heights"].keys())
-        scores = [data_cap["heights"][y] * 100 for y in years]
-        if len(years) > 1 and scores[0] != 0:
-            avg_growth = ((scores[-1]-scores[0])/(len(years)-1))/scores[0]*100
-            growths.append(avg_growth)
-            names_growth.append(name[:20])
-            colors_growth.append(category_colors.get(data_cap["category"], "#ffffff"))
-    
-    if growths:
-        sorted_growth = sorted(zip(growths, names_growth, colors_growth), reverse=True)
-        growths, names_growth, colors_growth = zip(*sorted_growth)
-    
+    # Bar 2: annual growth, sorted in descending order
+    growths = capabilities.growth[idx]
+    order = [j for j in np.argsort(-growths, kind="stable") if not np.isnan(growths[j])]
+    growths = growths[order]
     fig.add_trace(go.Bar(
-        y=list(names_growth), x=list(growths), orientation='h',
-        marker=dict(color=list(colors_growth), line=dict(color='white', width=1.5)),
-        text=[f"{g:.1f}%" for g in growths], textposition='outside', showlegend=False
+        y=[names[j] for j in order], x=growths, orientation='h',
+        marker=dict(color=[colors[j] for j in order]),
+        text=[f"{g:.1f}%" for g in growths],
     ), row=2, col=2)
     
     fig.update_layout(
-        template="plotly_dark",
+        template=OVERVIEW_TEMPLATE,
         height=900, showlegend=True,
-        paper_bgcolor="#0a0a15", plot_bgcolor="#12121e",
-        font=dict(family="Arial", size=13, color="white"),
+        font=dict(size=13),
         legend=dict(
             orientation="h",
             yanchor="bottom", y=1.02,
@@ -145,6 +117,35 @@ def build_figure(selected_caps):
 
 
 
+@cache
+def initial_figure():
+    """The figure of the default selection, built once and reused for every page visit."""
+    return build_figure(DEFAULT_SELECTION)
+
+
+@cache
+def capability_store_data() -> dict:
+    """Precomputed data shipped once to the browser, used by the clientside callback."""
+    def to_list(values):
+        return [None if np.isnan(value) else round(float(value), 3) for value in values]
+
+    capabilities = capability_series()
+    return {
+        "names": capabilities.names,
+        "labels": [name[:20] for name in capabilities.names],
+        "colors": capability_colors(),
+        "improvement": to_list(capabilities.improvement),
+        "growth": to_list(capabilities.growth),
+        "current": to_list(capabilities.current),
+    }
+
+
+def warm_up() -> None:
+    """Prepare the figure and the data of the default selection, see `dashboard.main.warm_up`."""
+    initial_figure()
+    capability_store_data()
+
+
 def layout():
     return [
         html.H3("Overview", className="mb-3"),
@@ -216,8 +217,8 @@ def layout():
                 dbc.CardHeader("✓ Select Capabilities", class_name="bg-primary text-white"),
                 dbc.CardBody(dcc.Checklist(
                     id="capability-checklist",
-                    options=[{"label": cap.replace("_", " ").title(), "value": cap} for cap in capabilities_data.keys()],
-                    value=["code_generation", "physical_intuition", "scientific_reasoning"],
+                    options=[{"label": cap.replace("_", " ").title(), "value": cap} for cap in capability_series().names],
+                    value=DEFAULT_SELECTION,
                     inputStyle={"marginRight": "10px"},
                     labelStyle={"display": "block", "padding": "5px", "cursor": "pointer", "borderRadius": "4px",
                                 "marginBottom": "4px", "transition": "all 0.2s"},
@@ -226,7 +227,12 @@ def layout():
             
             dbc.Card([
                 dbc.CardHeader("📊 Statistics", class_name="bg-success text-white"),
-                dbc.CardBody(html.Div(id="stats-display", style={"lineHeight": "1.8"}))
+                dbc.CardBody(html.Div([
+                    html.Div([html.Strong("Active Capabilities: "), html.Span(id="stats-active")]),
+                    html.Div([html.Strong("Avg Improvement: "), html.Span(id="stats-improvement")]),
+                    html.Div([html.Strong("Avg Annual Growth: "), html.Span(id="stats-growth")]),
+                    html.Div([html.Strong("Score Range: "), html.Span(id="stats-range")]),
+                ], id="stats-display", style={"lineHeight": "1.8"}))
             ], className="mb-4 shadow-sm", style={"borderRadius": "10px"}),
             
             dbc.Card([
@@ -240,7 +246,8 @@ def layout():
             ], className="shadow-sm", style={"borderRadius": "10px"}),
         ], width=3),
         
-        dbc.Col(dcc.Graph(id="capability-graph", figure=build_figure(["code_generation", "physical_intuition", "scientific_reasoning"])), width=9)
+        dbc.Col(dcc.Graph(id="capability-graph", figure=initial_figure()), width=9),
+        dcc.Store(id="capability-data", data=capability_store_data()),
     ])
 ], fluid=True, style={"backgroundColor": "#0a0a15", "minHeight": "100vh", "paddingTop": "20px", "paddingBottom": "40px"})
 
@@ -264,27 +271,23 @@ def layout():
 @load_df
 def update_overview(df: pd.DataFrame, _) -> tuple:
     """Callback to update numbers on the top of homepage."""
+    summary = Summary().get(df)
     return (
-        get_number_of_records(file_path),
-        total_benchmarks(file_path),
-        total_capabilities(file_path),
-
+        get_number_of_records(summary),
+        total_benchmarks(summary),
+        total_capabilities(summary),
     )
 
-@callback(
-    [Output("capability-graph", "figure"), Output("stats-display", "children")],
-    [Input("capability-checklist", "value")]
+# Selection is handled in the browser, see assets/js/overview.js
+clientside_callback(
+    ClientsideFunction(namespace="overview", function_name="update_dashboard"),
+    [
+        Output("capability-graph", "figure"),
+        Output("stats-active", "children"),
+        Output("stats-improvement", "children"),
+        Output("stats-growth", "children"),
+        Output("stats-range", "children"),
+    ],
+    Input("capability-checklist", "value"),
+    [State("capability-graph", "figure"), State("capability-data", "data")],
 )
-def update_dashboard(selected_caps):
-    fig = build_figure(selected_caps)
-    avg_imp, avg_growth, max_score, min_score = calculate_stats(selected_caps)
-    stats = [
-        html.Div([html.Strong("Active Capabilities: "), html.Span(f"{len(selected_caps)}/{len(capabilities_data)}")]),
-        html.Div([html.Strong("Avg Improvement: "), html.Span(f"+{avg_imp:.1f}%")]),
-        html.Div([html.Strong("Avg Annual Growth: "), html.Span(f"{avg_growth:.1f}%")]),
-        html.Div([html.Strong("Score Range: "), html.Span(f"{min_score:.1f}% - {max_score:.1f}%")])
-    ]
-    return fig, stats
-
-
-
@@ -0,0 +1,275 @@
+"""Benchmark suite of the hot paths of the dashboard.
+
+Every scale runs against its own copy of the data in a temporary directory: the cleaned dataset is replicated
+`scale` times (with distinct model names), and the store, the shared-memory dataset, the database and the filesystem
+cache are pointed at that directory. The following are timed:
+
+- `loader()` cold (compiling the store) and warm
+- `cleaned_data()` cold (publishing to shared memory) and warm
+- `Database().load` cold (full sync) and warm (same data version)
+- `overview.build_figure` for several selection sizes
+- `layout()` of every page
+- requests through the Flask test client: page, `_dash-layout`, a callback and the query API
+
+Results are written to `cache/perf/<timestamp>.json`, and compared with the previous run if there is one.
+
+Run `python -m dashboard.perf.bench --scales 1 10 100`.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import dash
+import pandas as pd
+from loguru import logger
+
+from dashboard import caching
+from dashboard.data import loader as loader_module
+from dashboard.data import capabilities, normalize, shared, store
+from dashboard.data.database import Database
+from dashboard.data.leaderboard import Leaderboard
+from dashboard.data.schema import SCHEMAS
+from dashboard.data.shared import SharedDataset
+from dashboard.data.summary import Summary
+from dashboard.singleton import SingletonMeta
+
+RESULTS_DIR = Path(__file__).resolve().parents[2] / "cache" / "perf"
+SELECTION_SIZES = [1, 3, 8, 16, 32]
+
+
+def measure(func, repeat: int = 5) -> dict:
+    """Call a function `repeat` times and return statistics of the durations in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "repeat": repeat,
+    }
+
+
+def measure_once(func) -> dict:
+    """Time a single call, for cold paths that change state."""
+    return measure(func, repeat=1)
+
+
+def scale_frame(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """Replicate a dataset `scale` times, giving the models of every copy a distinct name."""
+    copies = [df] + [df.assign(model=df["model"].astype(str) + f"~{i}") for i in range(1, scale)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def reset_state() -> None:
+    """Forget the in-process state that depends on the data: singletons, memoized data and figures, page caches."""
+    for cls in (SharedDataset, Database, Summary, Leaderboard):
+        SingletonMeta._instances.pop(cls, None)
+    store.invalidate()
+
+    caching.versioned_long_table.cache_clear()
+    caching.versioned_long_partition_index.cache_clear()
+    caching.FIGURES.clear()
+
+    # Functions of the pages memoized with `functools.cache`, e.g. `overview.capability_series`
+    for page in dash.page_registry.values():
+        module = sys.modules.get(page["module"])
+        for value in vars(module).values() if module is not None else ():
+            if hasattr(value, "cache_clear") and getattr(value, "__module__", None) == module.__name__:
+                value.cache_clear()
+
+
+@contextmanager
+def using_data(data_dir: Path):
+    """Point the store, the shared-memory dataset, the database and the filesystem cache at a directory.
+
+    The directory holds a `combined_benchmarks_cleaned.csv`, and optionally a `capability_heights.json` and an
+    `epoch_benchmark_data` directory of benchmark files (see `dashboard.perf.synthetic`). The app is imported, so that
+    the memoized figures are written to the directory rather than to the cache of the repository.
+    """
+    epoch_dir = data_dir / normalize.EPOCH_DIR.name
+    patches = [
+        (store, "SOURCE_DIRS", [data_dir, epoch_dir]),
+        (store, "STORE_DIR", data_dir / "store"),
+        (store, "MANIFEST_FILE", data_dir / "store" / "manifest.json"),
+        (loader_module, "CACHE_FILE", str(data_dir / Path(loader_module.CACHE_FILE).name)),
+        (shared, "SHARED_DIR", data_dir / "shared"),
+        (Database, "DB_FILE", data_dir / "scores.db"),
+    ]
+    if (data_dir / capabilities.CAPABILITY_HEIGHTS_FILE.name).is_file():
+        patches.append((capabilities, "CAPABILITY_HEIGHTS_FILE", data_dir / capabilities.CAPABILITY_HEIGHTS_FILE.name))
+    if epoch_dir.is_dir():
+        patches.append((normalize, "EPOCH_DIR", epoch_dir))
+    originals = [(target, name, getattr(target, name)) for target, name, _ in patches]
+    for target, name, value in patches:
+        setattr(target, name, value)
+    reset_state()
+
+    from dashboard.main import server
+
+    with server.app_context():
+        backend = caching.cache.cache
+    cache_dir = data_dir / "flask-cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    originals.append((backend, "_path", backend._path))
+    backend._path = str(cache_dir)
+    try:
+        yield
+    finally:
+        for target, name, value in originals:
+            setattr(target, name, value)
+        reset_state()
+
+
+@contextmanager
+def data_at_scale(scale: int, workdir: Path, source: pd.DataFrame):
+    """Point the app at a copy of the data scaled `scale` times, see `using_data`."""
+    data_dir = workdir / f"x{scale}"
+    data_dir.mkdir(parents=True)
+    scale_frame(source, scale).to_csv(data_dir / Path(loader_module.CACHE_FILE).name, index=False)
+    with using_data(data_dir):
+        yield
+
+
+def page_module(path: str):
+    """Return the module of the page registered at a path."""
+    for page in dash.page_registry.values():
+        if page.get("path_template") == path or page["path"] == path:
+            return sys.modules[page["module"]]
+    raise KeyError(f"No page registered at '{path}'")
+
+
+def callback_payload(outputs: list[tuple[str, str]], inputs: list[dict], state: list[dict] | None = None) -> dict:
+    """Build the body of a `_dash-update-component` request."""
+    # A callback with several outputs is identified by `..<id>.<prop>...<id>.<prop>..`, and receives a list of them
+    ids = [f"{component}.{prop}" for component, prop in outputs]
+    specs = [{"id": component, "property": prop} for component, prop in outputs]
+    return {
+        "output": ids[0] if len(ids) == 1 else f"..{'...'.join(ids)}..",
+        "outputs": specs[0] if len(specs) == 1 else specs,
+        "inputs": inputs,
+        "changedPropIds": [f"{item['id']}.{item['property']}" for item in inputs],
+        "state": state or [],
+    }
+
+
+def run_scale(scale: int, repeat: int) -> dict:
+    """Run all benchmarks against the data scaled `scale` times."""
+    from dashboard.caching import cleaned_data
+    from dashboard.main import server
+
+    overview = page_module("/")
+    benchmark = page_module("/benchmark/<name>")
+    client = server.test_client()
+    results = {}
+
+    results["loader.cold"] = measure_once(loader_module.loader)
+    results["loader.warm"] = measure(loader_module.loader, repeat)
+
+    results["cleaned_data.cold"] = measure_once(cleaned_data)
+    results["cleaned_data.warm"] = measure(cleaned_data, repeat)
+
+    df = cleaned_data()
+    results["rows"] = len(df.index)
+    results["Database.load.cold"] = measure_once(Database().load)
+    results["Database.load.warm"] = measure(Database().load, repeat)
+
+    names = overview.capability_series().names
+    for size in SELECTION_SIZES:
+        selection = names[:size]
+        results[f"overview.build_figure[{size}]"] = measure(lambda: overview.build_figure(selection), repeat)
+
+    with server.test_request_context():
+        results["overview.layout"] = measure(overview.layout, repeat)
+        results["benchmark.layout"] = measure(lambda: benchmark.layout(name=next(iter(SCHEMAS))), repeat)
+
+    overview_callback = callback_payload(
+        [("records", "children"), ("benchmarks", "children"), ("capabilities", "children")],
+        [{"id": "url", "property": "pathname", "value": "/"}],
+    )
+    requests = {
+        "GET /": lambda: client.get("/"),
+        "GET /_dash-layout": lambda: client.get("/_dash-layout"),
+        "POST /_dash-update-component (overview)": lambda: client.post(
+            "/_dash-update-component", json=overview_callback
+        ),
+        "GET /api/scores": lambda: client.get("/api/scores?limit=1000").get_data(),
+    }
+    for name, request in requests.items():
+        response = request()
+        status = getattr(response, "status_code", 200)
+        if status != 200:
+            logger.warning(f"{name} returned {status}")
+        results[name] = measure(request, repeat)
+
+    return results
+
+
+def git_revision() -> str | None:
+    """Return the short hash of the checked out commit, to tell runs apart."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(current: dict, previous: dict) -> None:
+    """Print the ratio of the median durations of two runs."""
+    for scale, results in current["scales"].items():
+        baseline = previous["scales"].get(scale, {})
+        for name, result in results.items():
+            if not isinstance(result, dict) or name not in baseline:
+                continue
+            ratio = result["median_ms"] / baseline[name]["median_ms"] if baseline[name]["median_ms"] else float("nan")
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"x{scale:<4} {name:50} {result['median_ms']:10.2f} ms  {ratio:6.2f}x{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="data scales to run at")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of every warm measurement")
+    parser.add_argument("--output", type=Path, default=None, help="result file, by default in cache/perf")
+    args = parser.parse_args()
+
+    source = pd.read_csv(loader_module.CACHE_FILE, low_memory=False)
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            logger.info(f"Running benchmarks at {scale}x data scale..")
+            with data_at_scale(scale, Path(workdir), source):
+                run["scales"][str(scale)] = run_scale(scale, args.repeat)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous_files = sorted(RESULTS_DIR.glob("[0-9]*.json"))
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    logger.info(f"Wrote results to {output}")
+
+    if previous_files:
+        with open(previous_files[-1], "r") as f:
+            compare(run, json.load(f))
+    else:
+        print(json.dumps(run["scales"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Load test of the Dash callbacks of a running app.
+
+Replays the requests a browser sends while using the dashboard, with a number of concurrent clients, and reports the
+p50/p95/p99 latency of every scenario:
+
+- `navigate`: a page navigation, i.e. the page content, sidebar, navbar and (on the overview) record count callbacks
+- `select`: a benchmark dropdown change, followed by the navigation to that benchmark
+- `zoom`: a zoom on the score over time of a benchmark, which redraws it at full resolution
+- `layout`: a first visit, i.e. the page itself and `_dash-layout`
+
+Changes of the capability checklist of the overview are handled in the browser (see `assets/js/overview.js`) and send
+no request, so they are not part of the load.
+
+Run the app against a synthetic dataset (see `dashboard.perf.synthetic`) and load it from another shell:
+
+    python -m dashboard.perf.loadtest serve --data cache/synthetic --port 8050
+    python -m dashboard.perf.loadtest run --url http://127.0.0.1:8050 --concurrency 16 --requests 2000
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from dashboard.data.schema import SCHEMAS
+from dashboard.perf.bench import RESULTS_DIR, callback_payload, using_data
+
+SCENARIO_WEIGHTS = {"navigate": 5, "select": 2, "zoom": 2, "layout": 1}
+PAGES = ["/", *(f"/benchmark/{name}" for name in SCHEMAS)]
+ZOOM_START = "2019-01-01"
+TIMEOUT = 60  # Seconds
+
+
+def navigation_callbacks(path: str) -> list[dict]:
+    """Return the callbacks fired by the app when the browser navigates to a path."""
+    location = [{"id": "url", "property": "pathname", "value": path}]
+    callbacks = [
+        callback_payload(
+            [("_pages_content", "children"), ("_pages_store", "data")],
+            [
+                {"id": "_pages_location", "property": "pathname", "value": path},
+                {"id": "_pages_location", "property": "search", "value": ""},
+            ],
+        ),
+        callback_payload([("sidebar-nav", "children")], location),
+        callback_payload(
+            [("navbar-collapse", "is_open")],
+            [{"id": "navbar-toggler", "property": "n_clicks", "value": None}, *location],
+            state=[{"id": "navbar-collapse", "property": "is_open", "value": False}],
+        ),
+    ]
+    if path == "/":
+        callbacks.append(
+            callback_payload([("records", "children"), ("benchmarks", "children"), ("capabilities", "children")], location)
+        )
+    return callbacks
+
+
+def random_zoom(rng: random.Random) -> dict:
+    """Return the `relayoutData` of a zoom on a random date range."""
+    start = np.datetime64(ZOOM_START) + rng.randrange(0, 5 * 365)
+    end = start + rng.randrange(30, 2 * 365)
+    return {"xaxis.range[0]": str(start), "xaxis.range[1]": str(end)}
+
+
+def scenario_requests(scenario: str, rng: random.Random) -> list[tuple[str, str, dict | None]]:
+    """Return the (method, path, body) requests of one occurrence of a scenario."""
+    update = "/_dash-update-component"
+    benchmark = rng.choice(list(SCHEMAS))
+    if scenario == "navigate":
+        return [("POST", update, body) for body in navigation_callbacks(rng.choice(PAGES))]
+    if scenario == "select":
+        dropdown = [{"id": "benchmark-dropdown-selection", "property": "value", "value": benchmark}]
+        select = callback_payload([("url", "pathname")], dropdown)
+        return [("POST", update, select)] + [
+            ("POST", update, body) for body in navigation_callbacks(f"/benchmark/{benchmark}")
+        ]
+    if scenario == "zoom":
+        zoom = callback_payload(
+            [("score-over-time-graph", "figure")],
+            [{"id": "score-over-time-graph", "property": "relayoutData", "value": random_zoom(rng)}],
+            state=[{"id": "benchmark-dropdown-selection", "property": "value", "value": benchmark}],
+        )
+        return [("POST", update, zoom)]
+    if scenario == "layout":
+        return [("GET", rng.choice(PAGES), None), ("GET", "/_dash-layout", None)]
+    raise ValueError(f"Unknown scenario '{scenario}'")
+
+
+def send(url: str, method: str, path: str, body: dict | None) -> int:
+    """Send a request and read the whole response, returning its status."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(
+        url + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json", "Accept-Encoding": "gzip, br"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run(url: str, concurrency: int, n_requests: int, seed: int = 0) -> dict:
+    """Replay `n_requests` scenarios with `concurrency` clients and return the latencies of every scenario.
+
+    The latency of a scenario is the time until all of its requests are answered, as a browser waits for all of them.
+    """
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    scenarios = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+
+    def client(i: int) -> None:
+        rng = random.Random(seed * 1_000_003 + i)
+        scenario = rng.choices(scenarios, weights)[0]
+        start = time.perf_counter()
+        statuses = [send(url, method, path, body) for method, path, body in scenario_requests(scenario, rng)]
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies[scenario].append(elapsed)
+            # 204 is the answer to a callback that updates nothing
+            errors[scenario] += sum(status not in (200, 204) for status in statuses)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(client, range(n_requests)))
+    duration = time.perf_counter() - start
+
+    report = {"url": url, "concurrency": concurrency, "requests": n_requests, "duration_s": round(duration, 3)}
+    report["throughput_per_s"] = round(n_requests / duration, 2)
+    report["scenarios"] = {}
+    for scenario, values in sorted(latencies.items()):
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        report["scenarios"][scenario] = {
+            "count": len(values),
+            "errors": errors[scenario],
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(max(values), 2),
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['requests']} scenarios, {report['concurrency']} clients, {report['throughput_per_s']}/s")
+    print(f"{'scenario':10} {'count':>7} {'errors':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for scenario, stats in report["scenarios"].items():
+        print(
+            f"{scenario:10} {stats['count']:7d} {stats['errors']:7d} {stats['p50_ms']:10.1f} {stats['p95_ms']:10.1f}"
+            f" {stats['p99_ms']:10.1f} {stats['max_ms']:10.1f}"
+        )
+
+
+def serve(data_dir: Path, port: int) -> None:
+    """Serve the app with the datasets of a directory, with the threaded development server."""
+    # The store keeps the paths of its sources, which must not depend on the working directory
+    data_dir = data_dir.resolve()
+    with using_data(data_dir):
+        from dashboard.main import app
+
+        logger.info(f"Serving the data of {data_dir} on port {port}")
+        app.run(port=port, debug=False, threaded=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="serve the app with the datasets of a directory")
+    serve_parser.add_argument("--data", type=Path, required=True, help="directory of the datasets")
+    serve_parser.add_argument("--port", type=int, default=8050)
+
+    run_parser = commands.add_parser("run", help="load a running app")
+    run_parser.add_argument("--url", default="http://127.0.0.1:8050", help="base URL of the app")
+    run_parser.add_argument("--concurrency", type=int, nargs="+", default=[8], help="concurrent clients, one run each")
+    run_parser.add_argument("--requests", type=int, default=1000, help="scenarios per run")
+    run_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.data, args.port)
+        return
+
+    reports = []
+    for concurrency in args.concurrency:
+        report = run(args.url.rstrip("/"), concurrency, args.requests, args.seed)
+        print_report(report)
+        reports.append(report)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"loadtest-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, "w") as f:
+        json.dump(reports, f, indent=2)
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
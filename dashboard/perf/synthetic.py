@@ -0,0 +1,232 @@
+"""Synthetic datasets at arbitrary scale.
+
+Writes a `combined_benchmarks_cleaned.csv`, a `capability_heights.json` and the Epoch benchmark files read by the
+benchmark pages, with any number of rows, models and benchmarks, drawn from distributions fitted on the real dataset:
+
+- the org and country of a model are drawn jointly from the real models, and its release date from the real release
+  dates (with a few weeks of jitter)
+- the training compute follows the log-linear trend of the real compute over time, with the same share of unknowns
+- benchmarks beyond the real ones are variants of real benchmarks, with the same capability and score distribution
+- the number of models evaluated on a benchmark is proportional to its share of the real rows
+- scores are drawn from the real score distribution of the benchmark, ranked by a latent model skill that grows with
+  the release date, so that newer models tend to score higher
+
+Run `python -m dashboard.perf.synthetic --rows 1000000 --models 5000 --benchmarks 200`, then point the app at the
+output directory with `python -m dashboard.perf.loadtest serve --data cache/synthetic`.
+"""
+
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from dashboard.data import capabilities, normalize
+from dashboard.data.loader import CACHE_FILE, loader
+from dashboard.data.schema import COMBINED_COLUMNS, SCHEMAS
+
+SYNTHETIC_DIR = Path(__file__).resolve().parents[2] / "cache" / "synthetic"
+COLUMNS = ["model", "benchmark", "date", "org", "country", "training_compute_flops", "score", "capability", "year"]
+
+QUANTILES = np.linspace(0, 1, 101)  # Resolution of the fitted score distributions
+DATE_JITTER_DAYS = 30
+SKILL_TREND = 0.8  # Weight of the release date in the latent skill of a model
+SKILL_NOISE = 0.6
+SCORE_NOISE = 0.5  # Noise of a single evaluation, in units of the latent skill
+
+
+def decimal_year(dates: pd.Series | np.ndarray) -> np.ndarray:
+    """Return dates as fractional years."""
+    dates = pd.DatetimeIndex(dates)
+    return (dates.year + (dates.dayofyear - 1) / 365.25).to_numpy(dtype=float)
+
+
+def fit_benchmarks(source: pd.DataFrame, n_benchmarks: int) -> pd.DataFrame:
+    """Return the synthetic benchmarks with their capability, share of rows and score quantiles.
+
+    Args:
+        source (pd.DataFrame): real dataset
+        n_benchmarks (int): number of benchmarks, the most common real benchmarks are kept if fewer than the real ones
+
+    Returns:
+        pd.DataFrame: one row per benchmark, with columns `benchmark`, `capability`, `share` and `quantiles`
+    """
+    grouped = source.dropna(subset=["score"]).groupby("benchmark", observed=True)
+    quantiles = grouped["score"].apply(lambda scores: np.quantile(scores.to_numpy(dtype=float), QUANTILES))
+    real = pd.DataFrame(
+        {
+            "capability": grouped["capability"].first(),
+            "share": grouped.size() / len(source.index),
+            "quantiles": quantiles,
+        }
+    ).sort_values("share", ascending=False)
+
+    # Variants of the real benchmarks, in order of popularity, beyond the real ones
+    positions = np.arange(n_benchmarks) % len(real.index)
+    benchmarks = real.iloc[positions].reset_index()
+    variant = np.arange(n_benchmarks) // len(real.index)
+    benchmarks["benchmark"] = np.where(
+        variant == 0, benchmarks["benchmark"], benchmarks["benchmark"] + "_v" + variant.astype(str)
+    )
+    benchmarks["share"] /= benchmarks["share"].sum()
+    return benchmarks
+
+
+def generate_models(source: pd.DataFrame, n_models: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Return synthetic models with their org, country, release date, training compute and latent skill."""
+    real = source.drop_duplicates(subset=["model"])
+
+    pairs = real[["org", "country"]].value_counts(normalize=True, dropna=False)
+    picks = rng.choice(len(pairs.index), size=n_models, p=pairs.to_numpy())
+    orgs = pairs.index.get_level_values("org")[picks]
+    countries = pairs.index.get_level_values("country")[picks]
+
+    real_dates = pd.to_datetime(real["date"], errors="coerce").dropna().to_numpy(dtype="datetime64[D]")
+    dates = rng.choice(real_dates, size=n_models) + rng.integers(
+        -DATE_JITTER_DAYS, DATE_JITTER_DAYS + 1, size=n_models
+    ).astype("timedelta64[D]")
+    years = decimal_year(dates)
+
+    # Log-linear trend of the training compute over time
+    known = real[real["training_compute_flops"] > 0]
+    known_years = decimal_year(pd.to_datetime(known["date"], errors="coerce"))
+    valid = ~np.isnan(known_years)
+    log_compute = np.log10(known["training_compute_flops"].to_numpy(dtype=float)[valid])
+    slope, intercept = np.polyfit(known_years[valid], log_compute, 1)
+    residual = np.std(log_compute - (intercept + slope * known_years[valid]))
+    compute = 10 ** (intercept + slope * years + rng.normal(0, residual, n_models))
+    compute[rng.random(n_models) < real["training_compute_flops"].isna().mean()] = np.nan
+
+    prefixes = (
+        pd.Series(orgs, dtype="string").fillna("model").str.split(",").str[0].str.lower()
+        .str.replace(r"\W+", "-", regex=True).str.strip("-")
+    )
+    skill = SKILL_TREND * (years - years.mean()) / (years.std() or 1) + rng.normal(0, SKILL_NOISE, n_models)
+
+    return pd.DataFrame(
+        {
+            "model": prefixes + "-" + pd.Series(np.arange(n_models)).map("{:07d}".format),
+            "date": dates,
+            "org": orgs,
+            "country": countries,
+            "training_compute_flops": compute,
+            "skill": skill,
+        }
+    )
+
+
+def generate(
+    source: pd.DataFrame, n_rows: int, n_models: int, n_benchmarks: int, seed: int = 0
+) -> pd.DataFrame:
+    """Generate a synthetic combined dataset.
+
+    Args:
+        source (pd.DataFrame): real dataset the distributions are fitted on
+        n_rows (int): approximate number of rows, at most `n_models * n_benchmarks`
+        n_models (int): number of models
+        n_benchmarks (int): number of benchmarks
+        seed (int): seed of the random generator
+
+    Returns:
+        pd.DataFrame: dataset with the columns of `combined_benchmarks_cleaned.csv`, unique on (model, benchmark)
+    """
+    rng = np.random.default_rng(seed)
+    models = generate_models(source, n_models, rng)
+    benchmarks = fit_benchmarks(source, n_benchmarks)
+
+    # Expected number of models evaluated on every benchmark
+    coverage = np.minimum(benchmarks["share"].to_numpy() * n_rows / n_models, 1.0)
+    counts = rng.binomial(n_models, coverage)
+
+    parts = []
+    skill = models["skill"].to_numpy()
+    for benchmark, count in zip(benchmarks.itertuples(index=False), counts):
+        if count == 0:
+            continue
+        evaluated = rng.choice(n_models, size=count, replace=False)
+        percentile = 1 / (1 + np.exp(-(skill[evaluated] + rng.normal(0, SCORE_NOISE, count))))
+        parts.append(
+            pd.DataFrame(
+                {
+                    "position": evaluated,
+                    "benchmark": benchmark.benchmark,
+                    "capability": benchmark.capability,
+                    "score": np.interp(percentile, QUANTILES, benchmark.quantiles).round(2),
+                }
+            )
+        )
+
+    rows = pd.concat(parts, ignore_index=True)
+    df = models.drop(columns="skill").iloc[rows["position"].to_numpy()].reset_index(drop=True)
+    df = pd.concat([df, rows.drop(columns="position")], axis=1)
+    df["year"] = df["date"].dt.year
+    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    return df[COLUMNS]
+
+
+def write_benchmark_files(df: pd.DataFrame, output_dir: Path) -> None:
+    """Write the rows of every benchmark with a schema as an Epoch benchmark file, see `dashboard.data.normalize`.
+
+    The rows of the variants of a benchmark (e.g. `mmlu_v2`) are written to the file of the benchmark, so that the
+    benchmark pages draw as many points as the synthetic dataset holds.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    base = df["benchmark"].str.replace(r"_v\d+$", "", regex=True)
+    for name, rows in df.groupby(base):
+        schema = SCHEMAS.get(name)
+        if schema is None:
+            continue
+        rows = rows.assign(date=pd.to_datetime(rows["date"]).dt.strftime(schema.date_format))
+        columns = {**{combined: column for column, combined in COMBINED_COLUMNS.items()}, "score": schema.score_column}
+        rows[list(columns)].rename(columns=columns).to_csv(output_dir / schema.file, index=False)
+    logger.info(f"Wrote the benchmark files to {output_dir}")
+
+
+def write_dataset(df: pd.DataFrame, output_dir: Path) -> None:
+    """Write a synthetic dataset, its capability heights and its benchmark files to a directory."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    csv_file = output_dir / Path(CACHE_FILE).name
+    df.to_csv(csv_file, index=False)
+    logger.info(f"Wrote {len(df.index)} rows to {csv_file}")
+
+    # Start from the real file, so that the real capabilities keep their names, categories and positions
+    heights_file = output_dir / capabilities.CAPABILITY_HEIGHTS_FILE.name
+    shutil.copyfile(capabilities.CAPABILITY_HEIGHTS_FILE, heights_file)
+    originals = capabilities.CAPABILITY_HEIGHTS_FILE, capabilities.FINGERPRINTS_FILE
+    capabilities.CAPABILITY_HEIGHTS_FILE = heights_file
+    capabilities.FINGERPRINTS_FILE = output_dir / capabilities.FINGERPRINTS_FILE.name
+    try:
+        capabilities.build_capability_heights(df, force=True)
+    finally:
+        capabilities.CAPABILITY_HEIGHTS_FILE, capabilities.FINGERPRINTS_FILE = originals
+    logger.info(f"Wrote {heights_file}")
+
+    write_benchmark_files(df, output_dir / normalize.EPOCH_DIR.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="approximate number of rows")
+    parser.add_argument("--models", type=int, default=5000, help="number of models")
+    parser.add_argument("--benchmarks", type=int, default=200, help="number of benchmarks")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    parser.add_argument("--output", type=Path, default=SYNTHETIC_DIR, help="output directory")
+    args = parser.parse_args()
+
+    source = loader(typed=False)
+    df = generate(source, args.rows, args.models, args.benchmarks, args.seed)
+    write_dataset(df, args.output)
+    summary = {
+        "rows": len(df.index),
+        "models": df["model"].nunique(),
+        "benchmarks": df["benchmark"].nunique(),
+        "orgs": df["org"].nunique(),
+    }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
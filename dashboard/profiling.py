@@ -0,0 +1,220 @@
+"""Opt-in sampling profiler of requests.
+
+A fraction of the requests, set with `DASHBOARD_PROFILE_RATE` (e.g. `0.01`), is profiled. Requests sent with the
+header `X-Profile: <DASHBOARD_PROFILE_TOKEN>` are always profiled, if a token is set. Profiling is off by default.
+
+While a request is profiled, a background thread samples the stack of the thread handling it every
+`DASHBOARD_PROFILE_INTERVAL` seconds (see `sys._current_frames`), so the request runs at full speed between samples.
+The samples are written in the collapsed stack format (`frame;frame;frame count`, readable by flamegraph.pl and
+speedscope) to `cache/profiles`, named after the route and the callback, and only the latest files are kept.
+
+Run `python -m dashboard.profiling` to print the functions with the most self time across the written profiles.
+"""
+
+import argparse
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from dash import Dash
+from flask import g, request
+from loguru import logger
+
+from dashboard.metrics import CALLBACK_PATH, callback_name
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+PROFILE_DIR = ROOT_DIR / "cache" / "profiles"
+PROFILE_SUFFIX = ".folded"
+MAX_PROFILES = 500  # Older profiles are deleted
+
+PROFILE_RATE = float(os.getenv("DASHBOARD_PROFILE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("DASHBOARD_PROFILE_TOKEN", "")
+PROFILE_INTERVAL = float(os.getenv("DASHBOARD_PROFILE_INTERVAL", "0.005"))  # Seconds
+PROFILE_HEADER = "X-Profile"
+
+
+def frame_label(frame) -> str:
+    """Return the name of a frame in a collapsed stack, e.g. `build_figure (dashboard/pages/overview.py:79)`."""
+    code = frame.f_code
+    filename = code.co_filename
+    if "site-packages" in filename:
+        filename = filename.split("site-packages", 1)[1].lstrip("/\\")
+    elif filename.startswith(str(ROOT_DIR)):
+        filename = os.path.relpath(filename, ROOT_DIR)
+    # Qualified names (e.g. `Summary.get`) are only recorded by Python 3.11+
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame) -> str:
+    """Return the stack of a frame from the root to the frame, as a collapsed stack."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """Background thread sampling the stacks of the threads being profiled.
+
+    The thread blocks on an event while no request is profiled, so that it only wakes up to take samples.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.profiles = {}  # Thread ID -> Counter of collapsed stacks
+        self.lock = threading.Lock()
+        self.active = threading.Event()  # Set while `profiles` is not empty
+        self.pid = None
+
+    def ensure_running(self) -> None:
+        # Threads do not survive a fork, so every worker process starts its own
+        if self.pid == os.getpid():
+            return
+        self.pid = os.getpid()
+        threading.Thread(target=self.run, name="profiler", daemon=True).start()
+
+    def run(self) -> None:
+        while True:
+            self.active.wait()
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.profiles:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, stacks in self.profiles.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[collapse(frame)] += 1
+
+    def start(self, thread_id: int) -> None:
+        self.ensure_running()
+        with self.lock:
+            self.profiles[thread_id] = Counter()
+            self.active.set()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self.lock:
+            stacks = self.profiles.pop(thread_id, Counter())
+            if not self.profiles:
+                self.active.clear()
+            return stacks
+
+
+sampler = Sampler()
+
+
+def should_profile() -> bool:
+    """Return True if the current request is to be profiled."""
+    token = request.headers.get(PROFILE_HEADER)
+    if PROFILE_TOKEN and token is not None and hmac.compare_digest(token, PROFILE_TOKEN):
+        return True
+    return PROFILE_RATE > 0 and random.random() < PROFILE_RATE
+
+
+def slug(value: str) -> str:
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in value).strip("_")[:80] or "root"
+
+
+def write_profile(stacks: Counter, route: str, callback: str | None, duration: float) -> Path:
+    """Write collapsed stacks to the profile directory and delete the oldest profiles beyond `MAX_PROFILES`."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    tags = [slug(route)] + ([slug(callback)] if callback else []) + [f"{duration * 1000:.0f}ms"]
+    path = PROFILE_DIR / f"{timestamp}-{'-'.join(tags)}{PROFILE_SUFFIX}"
+    with open(path, "w") as f:
+        f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    profiles = sorted(PROFILE_DIR.glob(f"*{PROFILE_SUFFIX}"))
+    for old in profiles[:-MAX_PROFILES]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def register_profiling(app: Dash) -> None:
+    """Profile the sampled requests of the Flask server of the app, if profiling is enabled."""
+    if PROFILE_RATE <= 0 and not PROFILE_TOKEN:
+        return
+    server = app.server
+    logger.info(f"Profiling {PROFILE_RATE:.1%} of the requests, writing to {PROFILE_DIR}")
+
+    @server.before_request
+    def start_profile() -> None:
+        if should_profile():
+            g.profile_start = time.perf_counter()
+            sampler.start(threading.get_ident())
+
+    @server.teardown_request
+    def stop_profile(_) -> None:
+        start = g.pop("profile_start", None)
+        if start is None:
+            return
+        stacks = sampler.stop(threading.get_ident())
+        if not stacks:
+            # Shorter than the sampling interval
+            return
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        callback = callback_name(app) if request.path == CALLBACK_PATH else None
+        write_profile(stacks, route, callback, time.perf_counter() - start)
+
+
+def read_profiles(pattern: str = "*") -> Counter:
+    """Sum the collapsed stacks of the written profiles whose name matches a pattern."""
+    stacks = Counter()
+    for path in PROFILE_DIR.glob(f"{pattern}{PROFILE_SUFFIX}"):
+        with open(path, "r") as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                stacks[stack] += int(count)
+    return stacks
+
+
+def self_time(stacks: Counter) -> Counter:
+    """Return the samples of every function at the top of a stack, i.e. its self time."""
+    functions = Counter()
+    for stack, count in stacks.items():
+        functions[stack.rsplit(";", 1)[-1]] += count
+    return functions
+
+
+def total_time(stacks: Counter) -> Counter:
+    """Return the samples of every function anywhere in a stack, i.e. its total time."""
+    functions = Counter()
+    for stack, count in stacks.items():
+        for function in set(stack.split(";")):
+            functions[function] += count
+    return functions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="*", help="glob on the profile names, e.g. '*update_overview*'")
+    parser.add_argument("--top", type=int, default=30, help="number of functions to print")
+    parser.add_argument("--output", type=Path, default=None, help="write the summed collapsed stacks to a file")
+    args = parser.parse_args()
+
+    stacks = read_profiles(args.filter)
+    if not stacks:
+        print(f"No profiles matching '{args.filter}' in {PROFILE_DIR}")
+        return
+    samples = sum(stacks.values())
+    totals = total_time(stacks)
+    print(f"{samples} samples, {samples * PROFILE_INTERVAL * 1000:.0f} ms at {PROFILE_INTERVAL * 1000:g} ms per sample")
+    print(f"{'self %':>7} {'total %':>8}  function")
+    for function, count in self_time(stacks).most_common(args.top):
+        print(f"{count / samples:7.1%} {totals[function] / samples:8.1%}  {function}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+if __name__ == "__main__":
+    main()
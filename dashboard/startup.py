@@ -0,0 +1,125 @@
+"""Startup mode and startup time report.
+
+By default the app initializes lazily: importing `dashboard.main` only builds the Dash app, and the data, the database
+and the page assets are loaded on first use. Set `DASHBOARD_INIT=eager` to load them while the app is imported instead
+(e.g. before a server forks its workers).
+
+Run `python -m dashboard.startup` to import the app with every module import timed, and print the slowest imports and
+the time of every initialization step.
+"""
+
+import importlib.abc
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from loguru import logger
+
+INIT_MODE = os.getenv("DASHBOARD_INIT", "lazy")
+
+# Initialization step -> duration in seconds
+INIT_TIMES = {}
+
+
+def is_eager() -> bool:
+    """Return True if the data should be loaded while the app is imported."""
+    return INIT_MODE == "eager"
+
+
+@contextmanager
+def timed(step: str):
+    """Record the duration of an initialization step."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INIT_TIMES[step] = time.perf_counter() - start
+        logger.debug(f"Initialized {step} in {INIT_TIMES[step] * 1000:.1f} ms")
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Measure the time spent executing every imported module.
+
+    The cumulative time of a module includes the modules it imports, its self time does not.
+    """
+
+    def __init__(self):
+        self.cumulative = {}
+        self.self_time = {}
+        self.stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        # Let the other finders locate the module, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        sys.meta_path.remove(self)
+
+    def report(self, limit: int = 25) -> str:
+        """Return the slowest imports and the initialization steps as a table."""
+        lines = [f"{'cumulative ms':>14} {'self ms':>10}  module"]
+        slowest = sorted(self.cumulative.items(), key=lambda item: item[1], reverse=True)[:limit]
+        for name, seconds in slowest:
+            lines.append(f"{seconds * 1000:14.1f} {self.self_time[name] * 1000:10.1f}  {name}")
+        lines.append("")
+        lines.append(f"{'ms':>14}  initialization step")
+        for step, seconds in INIT_TIMES.items():
+            lines.append(f"{seconds * 1000:14.1f}  {step}")
+        return "\n".join(lines)
+
+
+class TimedLoader(importlib.abc.Loader):
+    """Loader wrapper that reports the execution time of a module to an `ImportTimer`."""
+
+    def __init__(self, loader, timer: ImportTimer):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        self.timer.stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self.timer.stack.pop()
+            self.timer.cumulative[name] = elapsed
+            self.timer.self_time[name] = elapsed - children
+            if self.timer.stack:
+                self.timer.stack[-1] += elapsed
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+def main() -> None:
+    """Import the app with an `ImportTimer` installed and print the report."""
+    timer = ImportTimer()
+    timer.install()
+    with timed("import dashboard.main"):
+        import dashboard.main  # noqa: F401
+    timer.uninstall()
+    print(timer.report())
+
+
+if __name__ == "__main__":
+    # Run through the imported module, so that the steps timed by the app end up in the same `INIT_TIMES`
+    from dashboard.startup import main
+
+    main()
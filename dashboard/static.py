@@ -0,0 +1,198 @@
+"""Self-hosted static assets.
+
+Third-party assets (Bootstrap icons, fonts) are vendored into `static/vendor` once at build time, so the app never
+reaches out to a CDN at runtime. All files in `static` are then fingerprinted with their content hash and
+pre-compressed (gzip, and brotli if installed) into `static/build`, and served with immutable far-future cache headers.
+If the assets have not been built, they are served from `static` under their logical paths instead.
+
+The files of `assets/` are served by Dash, which versions their URLs with the modification time of the file. Those
+URLs get the same far-future cache headers, and their responses are compressed once (see `dashboard.compression`).
+
+Run `python -m dashboard.static` to vendor and build the assets.
+"""
+
+import hashlib
+import json
+import mimetypes
+import posixpath
+import re
+import shutil
+import urllib.request
+from functools import cache
+from pathlib import Path
+
+from flask import Flask, Response, request, send_from_directory
+from loguru import logger
+
+from dashboard.compression import (
+    ASSETS_PREFIX,
+    compress,
+    is_immutable_request,
+    negotiate_encoding,
+    supported_encodings,
+)
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / "static"
+VENDOR_DIR = STATIC_DIR / "vendor"
+BUILD_DIR = STATIC_DIR / "build"
+MANIFEST_FILE = BUILD_DIR / "manifest.json"
+
+ONE_YEAR = 60 * 60 * 24 * 365
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".json", ".svg", ".html", ".txt", ".map"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+BOOTSTRAP_ICONS = "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font"
+FIGTREE = "https://cdn.jsdelivr.net/npm/@fontsource-variable/figtree@5.1.1/files"
+
+# Local path (relative to `static/vendor`) -> source URL
+VENDOR_ASSETS = {
+    "bootstrap-icons/bootstrap-icons.min.css": f"{BOOTSTRAP_ICONS}/bootstrap-icons.min.css",
+    "bootstrap-icons/fonts/bootstrap-icons.woff2": f"{BOOTSTRAP_ICONS}/fonts/bootstrap-icons.woff2",
+    "bootstrap-icons/fonts/bootstrap-icons.woff": f"{BOOTSTRAP_ICONS}/fonts/bootstrap-icons.woff",
+    "figtree/figtree-latin-wght-normal.woff2": f"{FIGTREE}/figtree-latin-wght-normal.woff2",
+    "figtree/figtree-latin-wght-italic.woff2": f"{FIGTREE}/figtree-latin-wght-italic.woff2",
+}
+
+CSS_URL_PATTERN = re.compile(r"""url\(\s*["']?(?!data:|https?:|/)([^"')?#]+)([?#][^"')]*)?["']?\s*\)""")
+
+
+def vendor_assets(force: bool = False) -> None:
+    """Download the third-party assets into `static/vendor`.
+
+    Args:
+        force (bool): if True, assets that were downloaded before are fetched again
+    """
+    for relative_path, url in VENDOR_ASSETS.items():
+        path = VENDOR_DIR / relative_path
+        if path.is_file() and not force:
+            continue
+        logger.info(f"Fetching {url}..")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        urllib.request.urlretrieve(url, path)
+
+
+def fingerprint(relative_path: str, content: bytes) -> str:
+    """Return the path with the first characters of the content hash inserted before the suffix."""
+    path = Path(relative_path)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def rewrite_css_urls(css: str, css_path: str, manifest: dict[str, str]) -> str:
+    """Point relative `url(...)` references in a stylesheet to the fingerprinted files."""
+    base = posixpath.dirname(css_path)
+
+    def replace(match: re.Match) -> str:
+        target = posixpath.normpath(posixpath.join(base, match.group(1)))
+        if target not in manifest:
+            return match.group(0)
+        return f'url("{posixpath.relpath(manifest[target], base or ".")}")'
+
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def build_assets() -> dict[str, str]:
+    """Fingerprint and pre-compress every file in `static` into `static/build`.
+
+    Stylesheets are processed last, so that the files they reference can be rewritten to their fingerprinted names.
+
+    Returns:
+        dict[str, str]: manifest mapping the logical path of each asset to its fingerprinted path
+    """
+    if BUILD_DIR.exists():
+        shutil.rmtree(BUILD_DIR)
+    BUILD_DIR.mkdir(parents=True)
+
+    sources = sorted(
+        (path for path in STATIC_DIR.rglob("*") if path.is_file() and BUILD_DIR not in path.parents),
+        key=lambda path: (path.suffix == ".css", path.as_posix()),
+    )
+
+    manifest = {}
+    for source in sources:
+        relative_path = source.relative_to(STATIC_DIR).as_posix()
+        content = source.read_bytes()
+        if source.suffix == ".css":
+            content = rewrite_css_urls(content.decode(), relative_path, manifest).encode()
+
+        fingerprinted_path = fingerprint(relative_path, content)
+        target = BUILD_DIR / fingerprinted_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        if source.suffix in COMPRESSIBLE_SUFFIXES:
+            for encoding in supported_encodings():
+                suffix = ENCODING_SUFFIXES[encoding]
+                target.with_name(target.name + suffix).write_bytes(compress(content, encoding, best=True))
+
+        manifest[relative_path] = fingerprinted_path
+
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    logger.info(f"Built {len(manifest)} static assets into {BUILD_DIR}")
+    return manifest
+
+
+@cache
+def read_manifest() -> dict[str, str]:
+    """Return the asset manifest, read once per process."""
+    if not MANIFEST_FILE.is_file():
+        logger.warning("Static assets have not been built, run `python -m dashboard.static`")
+        return {}
+    with open(MANIFEST_FILE, "r") as f:
+        return json.load(f)
+
+
+@cache
+def fingerprinted_paths() -> frozenset[str]:
+    """Return the paths of all fingerprinted assets."""
+    return frozenset(read_manifest().values())
+
+
+def static_url(path: str) -> str:
+    """Return the URL of the fingerprinted version of a static asset, or of the asset itself if it was not built."""
+    fingerprinted_path = read_manifest().get(path)
+    if fingerprinted_path is None:
+        logger.warning(f"Static asset '{path}' has not been built, serving it without a fingerprint")
+        return f"/static/{path}"
+    return f"/static/{fingerprinted_path}"
+
+
+def serve_static(path: str) -> Response:
+    """Serve a static asset, pre-compressed if the client accepts it.
+
+    Fingerprinted assets never change, so they are marked immutable and cached for a year.
+    """
+    fingerprinted = path in fingerprinted_paths()
+    directory = BUILD_DIR if fingerprinted else STATIC_DIR
+
+    encoding = negotiate_encoding() if fingerprinted else None
+    if encoding is not None and (BUILD_DIR / f"{path}{ENCODING_SUFFIXES[encoding]}").is_file():
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        response = send_from_directory(directory, f"{path}{ENCODING_SUFFIXES[encoding]}", mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = send_from_directory(directory, path)
+
+    response.headers["Vary"] = "Accept-Encoding"
+    if fingerprinted:
+        response.headers["Cache-Control"] = f"public, max-age={ONE_YEAR}, immutable"
+    return response
+
+
+def cache_versioned_assets(response: Response) -> Response:
+    """Cache the files of `assets/` requested with a versioned URL for a year, as their URL changes with them."""
+    if request.path.startswith(ASSETS_PREFIX) and response.status_code == 200 and is_immutable_request():
+        response.headers["Cache-Control"] = f"public, max-age={ONE_YEAR}, immutable"
+    return response
+
+
+def register_static_route(server: Flask) -> None:
+    """Serve the contents of `static` on the Flask server, and cache the versioned files of `assets/`."""
+    server.add_url_rule("/static/<path:path>", "static_file", serve_static)
+    server.after_request(cache_versioned_assets)
+
+
+if __name__ == "__main__":
+    vendor_assets()
+    build_assets()
@@ -0,0 +1,84 @@
+"""Gunicorn configuration of the production server: `gunicorn -c gunicorn.conf.py dashboard.main:server`.
+
+The app is preloaded in the master process with eager initialization (see `dashboard.startup`), so the dataset, the
+parsed JSON and the precomputed figures are loaded once before the workers are forked, and shared copy-on-write.
+
+Sizing is configured through the environment:
+
+- `PORT`: port to bind to (default 8050)
+- `WEB_CONCURRENCY`: number of worker processes (default 2 * CPUs + 1)
+- `GUNICORN_THREADS`: threads per worker (default 2)
+- `GUNICORN_TIMEOUT`: seconds before a silent worker is restarted (default 120)
+- `GUNICORN_MAX_REQUESTS`: requests after which a worker is replaced by a fresh fork (default 1000, 0 disables)
+- `DASHBOARD_METRICS_DIR`: directory where the workers write their metrics, summed on every scrape of `/metrics`
+  (default a directory of this server in `/dev/shm`, removed when it stops)
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault("DASHBOARD_INIT", "eager")
+metrics_root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+os.environ.setdefault("DASHBOARD_METRICS_DIR", os.path.join(metrics_root, f"ai-dashboard-metrics-{os.getpid()}"))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8050')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+# Heartbeat files of the workers, kept in memory rather than on the container filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = "-"
+
+
+def when_ready(server):
+    """Runs in the master after the app has been loaded, before the workers are forked."""
+    # Objects created during warm-up are moved out of the collector's reach, so that garbage collections in the
+    # workers do not write to (and thereby copy) the pages they share with the master
+    gc.freeze()
+    server.log.info(f"App preloaded, forking {workers} workers with {threads} threads each")
+
+    from dashboard import metrics
+
+    # The metrics of the warm-up are counted once, in the file of the master
+    metrics.flush()
+
+
+def post_fork(server, worker):
+    """Runs in every worker right after it has been forked."""
+    from dashboard import metrics
+    from dashboard.data.database import Database
+
+    # Connections opened by the master during warm-up must not be used by several processes
+    engine = Database().engine
+    if engine is not None:
+        engine.dispose(close=False)
+
+    # The values inherited from the master are already in its own file
+    metrics.reset()
+
+
+def worker_exit(server, worker):
+    """Runs in a worker that is exiting."""
+    from dashboard import metrics
+
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    """Runs in the master after a worker has exited."""
+    from dashboard import metrics
+
+    metrics.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    shutil.rmtree(os.environ["DASHBOARD_METRICS_DIR"], ignore_errors=True)
@@ -0,0 +1,76 @@
+import json
+
+import pandas as pd
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from dashboard.api import api
+from dashboard.data import database
+from dashboard.data.database import Database
+from dashboard.singleton import SingletonMeta
+
+MODELS = [f"model-{i:02d}" for i in range(7)]
+BENCHMARKS = ["bbh", "gsm8k", "mmlu"]
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    SingletonMeta._instances.pop(Database, None)
+    monkeypatch.setattr(Database, "DB_FILE", tmp_path / "scores.db")
+    monkeypatch.setattr(database, "data_version", lambda: "v1")
+    df = pd.DataFrame(
+        [(model, benchmark, i * 0.01) for i, (model, benchmark) in enumerate(
+            (model, benchmark) for model in MODELS for benchmark in BENCHMARKS
+        )],
+        columns=["model", "benchmark", "score"],
+    )
+    Database().load(df, "v1")
+
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    yield app.test_client()
+    Database().engine.dispose()
+    SingletonMeta._instances.pop(Database, None)
+
+
+def rows(response) -> list[dict]:
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_cursor_round_trip(client):
+    keys, cursor, pages = [], None, 0
+    while True:
+        url = "/api/scores?limit=4&benchmark=gsm8k&benchmark=mmlu" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200
+        page = rows(response)
+        keys += [(row["model"], row["benchmark"]) for row in page]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert cursor and response.headers["Link"].endswith('rel="next"')
+
+    expected = sorted((model, benchmark) for model in MODELS for benchmark in ["gsm8k", "mmlu"])
+    assert keys == expected
+    assert pages == 4
+
+
+def test_invalid_cursor(client):
+    response = client.get("/api/scores?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_page_is_read_from_one_snapshot(client):
+    # The first chunk of a CSV page is its header, the rows are only queried when the body is read
+    response = client.get("/api/scores?limit=5&format=csv", buffered=False)
+    assert response.headers["X-Next-Cursor"]
+
+    # A sync commits between the boundary query and the streaming of the rows
+    with Database().engine.begin() as conn:
+        conn.execute(text("DELETE FROM scores"))
+
+    assert len(response.get_data(as_text=True).splitlines()) == 1 + 5
+    response.close()
+    assert client.get("/api/scores").get_data() == b""
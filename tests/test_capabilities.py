@@ -0,0 +1,62 @@
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from dashboard.data import capabilities
+from dashboard.data.capabilities import ALL, build_capability_heights
+
+
+def frame(rows: list[tuple[str, str, int, float]]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["model", "capability", "year", "score"])
+    return df.assign(benchmark=df["capability"] + "_bench", org="OpenAI", date=df["year"].astype(str) + "-06-01")
+
+
+COMMITTED_FILE = capabilities.CAPABILITY_HEIGHTS_FILE
+
+
+@pytest.fixture(autouse=True)
+def output(monkeypatch, tmp_path):
+    monkeypatch.setattr(capabilities, "CAPABILITY_HEIGHTS_FILE", tmp_path / "capability_heights.json")
+    monkeypatch.setattr(capabilities, "FINGERPRINTS_FILE", tmp_path / "cache" / "fingerprints.json")
+
+
+def recomputed(monkeypatch) -> list:
+    calls = []
+    prepare = capabilities.prepare
+    monkeypatch.setattr(capabilities, "prepare", lambda df: calls.append(sorted(df["capability"].unique())) or prepare(df))
+    return calls
+
+
+ROWS = [("a", "coding", 2020, 0.2), ("b", "coding", 2022, 0.6), ("a", "math", 2021, 0.4)]
+
+
+def test_only_changed_capabilities_are_recomputed(monkeypatch):
+    build_capability_heights(frame(ROWS))
+    calls = recomputed(monkeypatch)
+
+    result = build_capability_heights(frame([*ROWS[:2], ("a", "math", 2021, 0.5)]))
+    assert calls == [["math"]]
+    assert result[ALL]["math"]["heights"]["2021"] == 0.5
+    assert set(result[ALL]["coding"]["heights"]) == {"2020", "2021", "2022"}
+
+
+def test_all_capabilities_are_recomputed_when_the_years_change(monkeypatch):
+    build_capability_heights(frame(ROWS))
+    calls = recomputed(monkeypatch)
+
+    # A new year extends the extrapolation of every capability
+    result = build_capability_heights(frame([*ROWS, ("c", "math", 2023, 0.7)]))
+    assert calls == [["coding", "math"]]
+    assert set(result[ALL]["coding"]["heights"]) == {"2020", "2021", "2022", "2023"}
+
+
+def test_committed_heights_are_up_to_date():
+    """The committed file is the output of the build on the committed dataset, see `build_capability_heights`."""
+    # The metadata of the capabilities (names, positions, descriptions) is read from the existing file
+    shutil.copy(COMMITTED_FILE, capabilities.CAPABILITY_HEIGHTS_FILE)
+    result = build_capability_heights(force=True)
+
+    with open(COMMITTED_FILE, "r") as f:
+        assert json.load(f) == json.loads(json.dumps(result, default=str))
@@ -0,0 +1,88 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response
+
+from dashboard import compression
+
+ROWS = [{"model": f"model-{i}", "score": i} for i in range(200)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(compression, "data_version", lambda: "v1")
+    server = Flask(__name__)
+    closed = []
+
+    @server.get("/page")
+    def page():
+        return Response(json.dumps(ROWS), mimetype="application/json")
+
+    @server.get("/stream")
+    def stream():
+        def generate():
+            for row in ROWS:
+                yield json.dumps(row) + "\n"
+
+        response = Response(generate(), mimetype="application/x-ndjson")
+        response.call_on_close(lambda: closed.append(True))
+        return response
+
+    @server.get("/metrics")
+    def metrics():
+        return Response(json.dumps(ROWS), mimetype="text/plain", headers={"Cache-Control": "no-store"})
+
+    @server.get("/missing")
+    def missing():
+        return Response(json.dumps(ROWS), status=404, mimetype="application/json")
+
+    compression.register_compression(server)
+    client = server.test_client()
+    client.closed = closed
+    return client
+
+
+def test_compresses_and_revalidates(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data)) == ROWS
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"v1-')
+
+    revalidated = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_compresses_streamed_responses(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "ETag" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+    # The callbacks of the original response still run once the body has been sent
+    response.close()
+    assert client.closed == [True]
+
+
+def test_streamed_chunks_are_flushed(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    first = next(response.response)
+    # Every chunk is decodable as soon as it is received
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert json.loads(decompressor.decompress(first)) == ROWS[0]
+    response.close()
+
+
+def test_skips_no_store_and_errors(client):
+    for path in ("/metrics", "/missing"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "ETag" not in response.headers
+
+
+def test_uncompressed_without_accept_encoding(client):
+    response = client.get("/page", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.json == ROWS
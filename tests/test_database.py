@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from dashboard.data import database
+from dashboard.data.database import Database
+from dashboard.singleton import SingletonMeta
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    SingletonMeta._instances.pop(Database, None)
+    monkeypatch.setattr(Database, "DB_FILE", tmp_path / "scores.db")
+    yield Database()
+    if Database().engine is not None:
+        Database().engine.dispose()
+    SingletonMeta._instances.pop(Database, None)
+
+
+def frame(score: float) -> pd.DataFrame:
+    return pd.DataFrame({"model": ["a", "b"], "benchmark": ["mmlu", "mmlu"], "score": [score, 0.5], "year": [2024, 2023]})
+
+
+def test_concurrent_loads_create_one_engine_and_sync_once(monkeypatch, db):
+    engines, syncs = [], []
+    create_engine, sync = database.create_sqlite_engine, Database.sync
+    monkeypatch.setattr(database, "create_sqlite_engine", lambda path: engines.append(path) or create_engine(path))
+    monkeypatch.setattr(Database, "sync", lambda self, df, version: syncs.append(version) or sync(self, df, version))
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: db.load(frame(0.9), "v1"), range(16)))
+    assert len(engines) == 1
+    assert syncs == ["v1"]
+
+    db.load(frame(0.8), "v2")
+    assert syncs == ["v1", "v2"]
+    assert db.stored_version() == "v2"
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.graphs.downsample import PIXEL_BUDGET, downsample, frontier, lttb
+from dashboard.graphs.graphs import graph_score_over_time
+
+
+def series(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2019-01-01", periods=n, freq="h")
+    score = np.sin(np.linspace(0, 6 * np.pi, n)) + rng.normal(0, 0.1, n)
+    return pd.DataFrame({"date": dates, "score": score})
+
+
+def test_lttb_selects_sorted_positions_with_endpoints():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    selected = lttb(x, y, 500)
+    assert len(selected) == 500
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(5_000, dtype=float)
+    y = np.zeros(5_000)
+    y[1234], y[3210] = 10.0, -10.0
+    selected = lttb(x, y, 100)
+    assert {1234, 3210} <= set(selected)
+
+
+def test_lttb_short_series_unchanged():
+    x = np.arange(50, dtype=float)
+    np.testing.assert_array_equal(lttb(x, x, 100), np.arange(50))
+
+
+def test_downsample_keeps_frontier_and_order():
+    df = series(20_000)
+    result = downsample(df, "date", "score", budget=800)
+    assert 800 <= len(result) < len(df)
+    assert result.index.is_monotonic_increasing
+    best = df.index[frontier(df["score"].to_numpy())]
+    assert set(best) <= set(result.index)
+
+
+def test_zoomed_figure_is_redrawn_at_full_budget():
+    # What the zoom callback of the benchmark page draws for a date range
+    df = series(20_000).assign(org="Org", model="model")
+    date_range = ["2019-06-01", "2019-09-01"]
+    zoomed = df[(df["date"] >= date_range[0]) & (df["date"] <= date_range[1])]
+
+    fig = graph_score_over_time(df, date_range)
+    x = pd.to_datetime(np.concatenate([trace.x for trace in fig.data]))
+    assert x.min() == zoomed["date"].min() and x.max() == zoomed["date"].max()
+    assert PIXEL_BUDGET <= len(x) < len(zoomed)
+    assert fig.layout.xaxis.range == tuple(date_range)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.data import leaderboard
+from dashboard.data.leaderboard import Leaderboard, rank_columns
+from dashboard.singleton import SingletonMeta
+
+
+def frame(rows: list[tuple[str, str, float]]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["model", "benchmark", "score"])
+    return df.assign(org="Org", country="Country", date="2024-01-01")
+
+
+@pytest.fixture
+def board():
+    SingletonMeta._instances.pop(Leaderboard, None)
+    df = frame(
+        [
+            ("a", "mmlu", 90), ("b", "mmlu", 80), ("c", "mmlu", 70),
+            ("a", "gsm8k", 60), ("b", "gsm8k", 50),
+            ("a", "bbh", 40), ("b", "bbh", 30), ("c", "bbh", 20),
+        ]
+    )
+    yield Leaderboard().get(df, "v1")
+    SingletonMeta._instances.pop(Leaderboard, None)
+
+
+def test_rank_columns_ties_and_missing():
+    scores = np.array([[3.0], [1.0], [3.0], [np.nan]])
+    ranks, percentiles = rank_columns(scores, np.array([True]))
+    np.testing.assert_array_equal(ranks[:, 0], [1, 3, 1, np.nan])
+    np.testing.assert_array_equal(percentiles[:, 0], [100, 0, 100, np.nan])
+
+
+def test_rank_columns_lower_is_better():
+    ranks, _ = rank_columns(np.array([[3.0], [1.0], [2.0]]), np.array([False]))
+    np.testing.assert_array_equal(ranks[:, 0], [3, 1, 2])
+
+
+def test_ranking_over_all_benchmarks(board):
+    ranking = board.ranking()
+    # c has only 2 of the 3 benchmarks
+    assert ranking["model"].tolist() == ["a", "b"]
+    assert ranking["rank"].tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("selected, models", [(["mmlu"], ["a", "b", "c"]), (["mmlu", "gsm8k"], ["a", "b"])])
+def test_ranking_over_fewer_benchmarks_than_the_minimum(board, selected, models):
+    ranking = board.ranking(selected)
+    assert sorted(ranking["model"]) == models
+    assert ranking.iloc[0]["model"] == "a"
+
+
+def test_refresh_recomputes_only_changed_benchmarks(board, monkeypatch):
+    before = board.state
+    df = frame(
+        [
+            ("a", "mmlu", 90), ("b", "mmlu", 80), ("c", "mmlu", 70),
+            ("a", "gsm8k", 60), ("b", "gsm8k", 50), ("d", "gsm8k", 99),
+            ("a", "bbh", 40), ("b", "bbh", 30), ("c", "bbh", 20),
+        ]
+    )
+    calls = []
+    original = leaderboard.pivot
+
+    def pivot(rows, *args):
+        calls.append(set(rows["benchmark"]))
+        return original(rows, *args)
+
+    monkeypatch.setattr(leaderboard, "pivot", pivot)
+    board.get(df, "v2")
+
+    assert calls == [{"gsm8k"}]
+    assert board.state is not before
+    assert board.models.index.tolist() == ["a", "b", "c", "d"]
+    gsm8k = board.benchmarks.get_loc("gsm8k")
+    assert board.state.ranks[board.models.index.get_loc("d"), gsm8k] == 1
+    # The published state of the previous version is left untouched for its readers
+    assert before.scores.shape == (3, 3)
+
+
+def test_update_benchmark(board):
+    board.update_benchmark("mmlu", pd.DataFrame({"model": ["a", "b", "c"], "score": [10, 20, 30]}))
+    ranking = board.ranking(["mmlu"])
+    assert ranking["model"].tolist() == ["c", "b", "a"]
+
+
+def test_same_version_is_not_refreshed(board):
+    before = board.state
+    board.get(frame([("z", "mmlu", 1)]), "v1")
+    assert board.state is before
@@ -0,0 +1,64 @@
+import io
+
+import pandas as pd
+
+from dashboard.data import loader
+
+
+def raw_rows(rows: list[tuple]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["model", "benchmark", "date", "score"])
+    return df.assign(org="OpenAI", country="United States of America", training_compute_flops="", capability="math")
+
+
+def test_normalize_reasoning_effort():
+    df = pd.DataFrame(
+        {
+            "model": pd.array(
+                [
+                    "o3-2025-04-16_high",
+                    "claude-sonnet-4-20250514_16k",
+                    "gemini-2.5-flash-preview-04-17 (24K thinking)",
+                    "gpt-4o-2024-08-06",
+                ],
+                dtype="string",
+            )
+        }
+    )
+    result = loader.normalize_reasoning_effort(df)
+    assert result["model"].tolist() == [
+        "o3-2025-04-16_high",
+        "claude-sonnet-4-20250514_16K",
+        "gemini-2.5-flash-preview-04-17_24K",
+        "gpt-4o-2024-08-06",
+    ]
+    assert result["reasoning_effort"].fillna("").tolist() == ["high", "16K", "24K", ""]
+
+
+def test_clean_data_keeps_the_best_score_per_model_and_benchmark():
+    df = raw_rows(
+        [
+            ("QwQ-32B (16K thinking)", "gpqa", "2025-03-05", 60.0),
+            ("QwQ-32B_16K", "gpqa", "2025-03-05", 65.0),
+            (" gpt-4o ", "gpqa", "2024-05-13", 50.0),
+            ("gpt-4o", "gpqa", "2024-05-13", 40.0),
+            ("gpt-4o", "math", "2024-05-13", 70.0),
+            ("gpt-4o", "mmlu", "not a date", 80.0),
+            ("gpt-4o", "hle", "2024-05-13", "n/a"),
+            ("", "gpqa", "2024-05-13", 10.0),
+        ]
+    )
+    result = loader.clean_data(df)
+    assert list(zip(result["model"], result["benchmark"], result["score"])) == [
+        ("QwQ-32B_16K", "gpqa", 65.0),
+        ("gpt-4o", "gpqa", 50.0),
+        ("gpt-4o", "math", 70.0),
+    ]
+    assert result["year"].tolist() == [2025, 2024, 2024]
+
+
+def test_cleaned_data_is_up_to_date():
+    """The committed cleaned dataset is the output of `clean_data` on the raw one, see `write_cleaned_data`."""
+    expected = loader.load_data()
+    committed = pd.read_csv(loader.CACHE_FILE, low_memory=False)
+    assert not committed.duplicated(subset=["model", "benchmark"]).any()
+    pd.testing.assert_frame_equal(committed, pd.read_csv(io.StringIO(expected.to_csv(index=False))))
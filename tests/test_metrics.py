@@ -0,0 +1,54 @@
+from flask import Flask
+from flask_caching import Cache
+
+from dashboard import metrics
+from dashboard.metrics import CACHE_REQUESTS, CACHE_SETS, instrument_cache
+
+
+def counts() -> tuple:
+    return CACHE_REQUESTS.values.get(("hit",), 0), CACHE_REQUESTS.values.get(("miss",), 0), CACHE_SETS.values.get((), 0)
+
+
+def test_memoized_calls_are_counted_once(tmp_path):
+    cache = Cache(config={"CACHE_TYPE": "filesystem", "CACHE_DIR": str(tmp_path)})
+    cache.init_app(Flask(__name__))
+    instrument_cache(cache)
+
+    @cache.memoize()
+    def square(value: int) -> int:
+        return value * value
+
+    hits, misses, sets = counts()
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    # The version keys looked up by memoize on every call are left out
+    assert counts() == (hits + 1, misses + 2, sets + 2)
+
+
+def test_metrics_are_summed_over_processes(monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "METRICS_DIR", tmp_path)
+    counter = metrics.Counter("test_requests", "Requests.", ("route",))
+    histogram = metrics.Histogram("test_seconds", "Latency.", buckets=(0.1, 1.0))
+    try:
+        # Two workers, one of which has exited
+        counter.inc(route="/")
+        histogram.observe(0.05)
+        metrics.write_json(metrics.process_file(1), metrics.process_values())
+        metrics.mark_process_dead(1)
+        assert not metrics.process_file(1).exists()
+        metrics.reset()
+
+        counter.inc(2, route="/")
+        histogram.observe(0.5)
+        metrics.write_json(metrics.process_file(2), metrics.process_values())
+        metrics.reset()
+
+        counter.inc(route="/api")
+        text = metrics.render()
+        assert 'test_requests_total{route="/"} 3' in text
+        assert 'test_requests_total{route="/api"} 1' in text
+        assert 'test_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_seconds_bucket{le="1"} 2' in text
+        assert "test_seconds_count 2" in text
+    finally:
+        metrics.REGISTRY.remove(counter)
+        metrics.REGISTRY.remove(histogram)
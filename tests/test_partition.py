@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from dashboard.data.partition import PartitionIndex
+from dashboard.decorators import filter_by
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "benchmark": ["mmlu", "gsm8k", "mmlu", "bbh", "gsm8k"],
+            "org": ["A", "B", "B", "A", "C"],
+            "score": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+
+
+def test_select_matches_mask(df):
+    index = PartitionIndex(df)
+    pd.testing.assert_frame_equal(index.select("benchmark", "mmlu"), df[df["benchmark"] == "mmlu"])
+    pd.testing.assert_frame_equal(index.select("org", ["A", "C"]), df[df["org"].isin(["A", "C"])])
+    assert index.select("org", "missing").empty
+
+
+def test_filter_by(df):
+    filtered = filter_by("org")(lambda frame: frame)(df, "B")
+    assert filtered["score"].tolist() == [2.0, 3.0]
+
+    # Decorators compose, the outermost one consumes the first value
+    filtered = filter_by("org")(filter_by("benchmark")(lambda frame: frame))(df, ["A", "C"], ["bbh", "gsm8k"])
+    assert filtered["score"].tolist() == [4.0, 5.0]
+
+    assert filter_by("org")(lambda frame: frame)(df, None) is df
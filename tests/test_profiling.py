@@ -0,0 +1,30 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from dashboard.profiling import Sampler, frame_label
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_samples_only_while_profiling():
+    sampler = Sampler(interval=0.001)
+    thread_id = threading.get_ident()
+    assert not sampler.active.is_set()
+
+    sampler.start(thread_id)
+    busy(0.05)
+    stacks = sampler.stop(thread_id)
+
+    assert not sampler.active.is_set()
+    assert any("busy (tests/test_profiling.py" in stack for stack in stacks)
+
+
+def test_frame_label_without_qualified_name():
+    # Code objects of Python < 3.11 have no co_qualname
+    code = SimpleNamespace(co_name="get", co_filename="/elsewhere/module.py", co_firstlineno=12)
+    assert frame_label(SimpleNamespace(f_code=code)) == "get (/elsewhere/module.py:12)"
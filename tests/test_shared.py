@@ -0,0 +1,46 @@
+import threading
+
+import pandas as pd
+
+from dashboard.data import shared
+
+
+def test_publish_keeps_the_current_version(monkeypatch, tmp_path):
+    monkeypatch.setattr(shared, "SHARED_DIR", tmp_path)
+    monkeypatch.setattr(shared, "read_manifest", lambda: {"datasets": {}, "version": "newer"})
+    df = pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]})
+
+    old = shared.publish(df, "old")
+    newer = shared.publish(df, "newer")
+    assert not old.exists()
+
+    # Published by a worker lagging behind the store, after the current version
+    path = shared.publish(df, "lagging")
+    assert newer.exists()
+    pd.testing.assert_frame_equal(shared.attach(path), df)
+
+    shared.publish(df, "newer")
+    assert not path.exists()
+
+
+def test_concurrent_publishers(monkeypatch, tmp_path):
+    monkeypatch.setattr(shared, "SHARED_DIR", tmp_path)
+    monkeypatch.setattr(shared, "read_manifest", lambda: {"datasets": {}})
+    df = pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]})
+    errors = []
+
+    def publish():
+        try:
+            shared.publish(df, "current")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=publish) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [path.name for path in tmp_path.iterdir()] == ["dataset-current.arrow"]
+    pd.testing.assert_frame_equal(shared.attach(shared.dataset_path("current")), df)
@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+from flask import Flask, send_from_directory
+
+from dashboard import compression, static
+from dashboard.static import ONE_YEAR
+
+CSS = "body { font-family: Figtree, sans-serif; }\n" * 50
+
+
+@pytest.fixture
+def static_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(static, "STATIC_DIR", tmp_path)
+    monkeypatch.setattr(static, "BUILD_DIR", tmp_path / "build")
+    monkeypatch.setattr(static, "MANIFEST_FILE", tmp_path / "build" / "manifest.json")
+    static.read_manifest.cache_clear()
+    static.fingerprinted_paths.cache_clear()
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "fonts.css").write_text(CSS)
+    yield tmp_path
+    static.read_manifest.cache_clear()
+    static.fingerprinted_paths.cache_clear()
+
+
+@pytest.fixture
+def client(monkeypatch, static_dir):
+    monkeypatch.setattr(compression, "data_version", lambda: "v1")
+    server = Flask(__name__, static_folder=None)
+    server.add_url_rule(
+        "/assets/<path:filename>", "assets", lambda filename: send_from_directory(static_dir, filename)
+    )
+    static.register_static_route(server)
+    compression.register_compression(server)
+    return server.test_client()
+
+
+def test_unbuilt_assets_are_served_without_a_fingerprint(client):
+    url = static.static_url("css/fonts.css")
+    assert url == "/static/css/fonts.css"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+
+
+def test_built_assets_are_fingerprinted(client):
+    static.build_assets()
+    static.read_manifest.cache_clear()
+    static.fingerprinted_paths.cache_clear()
+
+    url = static.static_url("css/fonts.css")
+    assert url != "/static/css/fonts.css"
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Cache-Control"] == f"public, max-age={ONE_YEAR}, immutable"
+    assert gzip.decompress(response.data).decode() == CSS
+
+
+def test_versioned_dash_assets_are_cached_and_compressed(client):
+    response = client.get("/assets/css/fonts.css?m=1762442599.0", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Cache-Control"] == f"public, max-age={ONE_YEAR}, immutable"
+    assert gzip.decompress(response.data).decode() == CSS
+
+    # Without the version, the URL does not change with the file
+    response = client.get("/assets/css/fonts.css", headers={"Accept-Encoding": "gzip"})
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+    assert "Content-Encoding" not in response.headers
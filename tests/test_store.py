@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from dashboard.data import store
+
+
+@pytest.fixture
+def source_dir(monkeypatch, tmp_path):
+    # Outside of the repository, as the datasets of the benchmarks and of the load test are
+    source_dir = tmp_path / "data"
+    source_dir.mkdir()
+    monkeypatch.setattr(store, "SOURCE_DIRS", [source_dir])
+    monkeypatch.setattr(store, "STORE_DIR", tmp_path / "store")
+    monkeypatch.setattr(store, "MANIFEST_FILE", tmp_path / "store" / "manifest.json")
+    store.invalidate()
+    yield source_dir
+    store.invalidate()
+
+
+def test_build_store_with_a_source_outside_the_repository(source_dir):
+    df = pd.DataFrame({"model": ["a", "b"], "score": [0.5, 0.25]})
+    df.to_csv(source_dir / "scores.csv", index=False)
+
+    manifest = store.build_store()
+    assert manifest["datasets"]["scores"]["source"] == str((source_dir / "scores.csv").resolve())
+    pd.testing.assert_frame_equal(store.read_dataset("scores"), df)
+
+    version = store.data_version()
+    assert store.build_store() == manifest
+    df.assign(score=[0.5, 0.75]).to_csv(source_dir / "scores.csv", index=False)
+    assert store.build_store(force=True)["version"] != version
+
+
+def test_source_label_inside_the_repository():
+    assert store.source_label(store.ROOT_DIR / "data" / "processed" / "x.csv") == "data/processed/x.csv"